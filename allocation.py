@@ -0,0 +1,191 @@
+"""
+Capacity-aware allocation
+Assigns every student to at most one internship so that no internship exceeds
+its capacity and the total match score is as high as possible.
+"""
+
+import heapq
+import logging
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from catalog_index import CatalogIndex
+from matching_engine import MatchingEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds the auction may run; callers can ask for less or more, up to the cap
+DEFAULT_TIME_BUDGET = 30.0
+MAX_TIME_BUDGET = 300.0
+
+
+def clamp_time_budget(seconds: Optional[float]) -> float:
+    """A finite, positive auction budget: the default when unset, at most MAX_TIME_BUDGET."""
+    if seconds is None or not seconds > 0:
+        return DEFAULT_TIME_BUDGET
+    return min(float(seconds), MAX_TIME_BUDGET)
+
+
+class AllocationSolver:
+    """Auction-based solver for the capacitated student/internship assignment.
+
+    Each student keeps the ``candidates_per_student`` best internships from the
+    batch scorer, so memory is ``O(students x candidates)`` rather than the full
+    score matrix. Scores come from ``MatchingEngine.calculate_match_score``, so
+    the affirmative-action weighting is part of every bid.
+
+    The auction follows Bertsekas: an unassigned student bids for the
+    internship with the best score-minus-price, raising its price by the gap to
+    their second-best option plus ``epsilon``. A full internship evicts its
+    lowest bidder. The final assignment is within ``students x epsilon`` of the
+    best total score achievable over the candidate lists. Internships with no
+    capacity set are treated as unlimited, a capacity of 0 takes nobody, and a
+    negative capacity is rejected with ValueError.
+
+    ``time_budget`` covers candidate scoring as well as the auction. Students
+    not scored before it runs out stay unassigned and the report is marked
+    incomplete.
+    """
+
+    def __init__(self, engine: Optional[MatchingEngine] = None, candidates_per_student: int = 50,
+                 epsilon: float = 0.01, chunk_size: int = 256,
+                 time_budget: Optional[float] = DEFAULT_TIME_BUDGET):
+        self.engine = engine or MatchingEngine()
+        self.candidates_per_student = candidates_per_student
+        self.epsilon = epsilon
+        self.chunk_size = chunk_size
+        self.time_budget = time_budget
+
+    def allocate(self, students: List[Dict[str, Any]], catalog: CatalogIndex) -> Dict[str, Any]:
+        """Run scoring and the auction; return assignments plus a timing report."""
+        capacities = self._capacities(catalog)
+        started = time.perf_counter()
+        deadline = started + self.time_budget if self.time_budget else None
+
+        closed = np.array([j for j, capacity in enumerate(capacities) if capacity == 0], dtype=np.int64)
+        candidate_rows, candidate_scores, scored = self._candidates(students, catalog, closed, deadline)
+        scored_at = time.perf_counter()
+
+        owner, complete = self._auction(candidate_rows[:scored], candidate_scores[:scored], capacities, deadline)
+        complete = complete and scored == len(students)
+        finished = time.perf_counter()
+
+        assignments = {}
+        total_score = 0.0
+        for i, j in enumerate(owner):
+            if j >= 0:
+                score = float(candidate_scores[i][candidate_rows[i] == j][0])
+                assignments[students[i]['id']] = {
+                    'internship_id': catalog.internships[j]['id'],
+                    'score': round(score, 2),
+                }
+                total_score += score
+
+        report = {
+            'assignments': assignments,
+            'assigned': len(assignments),
+            'unassigned': len(students) - len(assignments),
+            'total_score': round(total_score, 2),
+            'complete': complete,
+            'scored': scored,
+            'timings': {
+                'scoring_seconds': round(scored_at - started, 3),
+                'auction_seconds': round(finished - scored_at, 3),
+                'total_seconds': round(finished - started, 3),
+            },
+            'candidate_bytes': int(candidate_rows.nbytes + candidate_scores.nbytes),
+        }
+        logger.info(f"Allocated {report['assigned']}/{len(students)} students in "
+                    f"{report['timings']['total_seconds']}s (complete={complete})")
+        return report
+
+    def _candidates(self, students: List[Dict[str, Any]], catalog: CatalogIndex, closed: np.ndarray,
+                    deadline: Optional[float]):
+        """Best internship rows and scores per student, in chunked batches.
+
+        ``closed`` rows (no seats) score -inf, so no student ever bids on them.
+
+        Returns (rows, scores, scored): only the first ``scored`` students
+        have candidates, fewer than all when the deadline passes between
+        chunks.
+        """
+        k = min(self.candidates_per_student, len(catalog))
+        rows = np.zeros((len(students), k), dtype=np.int32)
+        scores = np.zeros((len(students), k), dtype=np.float64)
+        if not k:
+            return rows, scores, len(students)
+
+        offset = 0
+        for chunk, block in self.engine.iter_score_blocks(students, catalog, self.chunk_size):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            block[:, closed] = -np.inf
+            if k < block.shape[1]:
+                top = np.argpartition(block, block.shape[1] - k, axis=1)[:, -k:]
+            else:
+                top = np.broadcast_to(np.arange(k), block.shape).copy()
+            rows[offset:offset + len(chunk)] = top
+            scores[offset:offset + len(chunk)] = np.take_along_axis(block, top, axis=1)
+            offset += len(chunk)
+        return rows, scores, offset
+
+    @staticmethod
+    def _capacities(catalog: CatalogIndex) -> List[Optional[int]]:
+        """Seats per internship; None (unlimited) when no capacity is set."""
+        capacities = []
+        for internship in catalog.internships:
+            capacity = internship.get('capacity')
+            if capacity is None or capacity == '':
+                capacities.append(None)
+                continue
+            if int(capacity) < 0:
+                raise ValueError(f"Internship {internship['id']} has negative capacity {capacity}")
+            capacities.append(int(capacity))
+        return capacities
+
+    def _auction(self, candidate_rows: np.ndarray, candidate_scores: np.ndarray,
+                 capacities: List[Optional[int]], deadline: Optional[float]):
+        """Forward auction; returns (owner row per student or -1, complete)."""
+        n_students = candidate_rows.shape[0]
+        prices = np.zeros(len(capacities))
+        # Per internship: min-heap of (bid, student) for the seats it holds
+        held: List[List[tuple]] = [[] for _ in capacities]
+        owner = [-1] * n_students
+        queue = deque(i for i in range(n_students) if candidate_rows.shape[1])
+        bids = 0
+
+        while queue:
+            bids += 1
+            if deadline is not None and bids % 1024 == 0 and time.perf_counter() > deadline:
+                return owner, False
+
+            i = queue.popleft()
+            rows = candidate_rows[i]
+            net = candidate_scores[i] - prices[rows]
+            best = int(net.argmax())
+            best_value = net[best]
+            if best_value <= 0:
+                # Staying unassigned (value 0) is at least as good
+                continue
+            net[best] = -np.inf
+            second_value = max(float(net.max()), 0.0)
+
+            j = int(rows[best])
+            owner[i] = j
+            capacity = capacities[j]
+            if capacity is None:
+                continue
+
+            seats = held[j]
+            heapq.heappush(seats, (prices[j] + (best_value - second_value) + self.epsilon, i))
+            if len(seats) > capacity:
+                _, evicted = heapq.heappop(seats)
+                owner[evicted] = -1
+                queue.append(evicted)
+            if len(seats) >= capacity:
+                prices[j] = seats[0][0]
+
+        return owner, True
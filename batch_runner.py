@@ -0,0 +1,162 @@
+"""
+Sharded batch matching
+Splits the cohort into shards, scores them in a process pool whose workers
+each compile the catalog once, and writes each shard in bulk.
+
+Usage:
+    python batch_runner.py --workers 8 --shard-size 2000
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional
+
+from catalog_index import CatalogIndex
+from matching_engine import MatchingEngine
+from records import MatchRecord
+
+logger = logging.getLogger(__name__)
+
+# Worker state, rebuilt once per pool process by _init_worker. Workers are
+# started with forkserver (or spawn), never forked from the caller: the web
+# server calls this from a job thread, and a forked child could inherit a
+# lock some other thread was holding. The engine itself does not pickle, so
+# only its class, its weights and the catalog rows cross the process boundary.
+_catalog: Optional[CatalogIndex] = None
+_engine: Optional[MatchingEngine] = None
+
+
+def _init_worker(engine_class: type, weights: Dict[str, float],
+                 internships: List[Dict[str, Any]], version: Optional[int]):
+    global _catalog, _engine
+    _engine = engine_class()
+    _engine.weights = dict(weights)
+    _catalog = CatalogIndex(internships, version=version)
+
+
+def _match_shard(task: tuple) -> List[tuple]:
+    shard, top_k = task
+    return _score_shard(_engine, _catalog, shard, top_k)
+
+
+def _score_shard(engine: MatchingEngine, catalog: CatalogIndex,
+                 shard: List[Dict[str, Any]], top_k: int) -> List[tuple]:
+    """Score one shard; rows refer to internships by catalog position."""
+    results = []
+    # Reasoning is not stored; it is derived when a list is shown
+    batch = engine.find_matches_batch(shard, catalog, top_k=top_k, include_reasoning=False)
+    for student, matches in zip(shard, batch):
+        results.append((student['id'], engine.profile_hash(student), [
+            (catalog.positions[m.internship['id']], m.score, m.rank)
+            for m in matches
+        ]))
+    return results
+
+
+class BatchRunner:
+    """Runs matching for the whole cohort and persists one row per student."""
+
+    def __init__(self, data_manager, engine: Optional[MatchingEngine] = None,
+                 workers: Optional[int] = None, shard_size: int = 2000, top_k: int = 10):
+        self.data_manager = data_manager
+        self.engine = engine or MatchingEngine()
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.top_k = top_k
+
+    def run(self, students: Optional[List[Dict[str, Any]]] = None,
+            on_progress: Optional[Callable[[int, int], bool]] = None) -> Dict[str, Any]:
+        """Match every student (or the given ones) and return a run summary.
+
+        ``on_progress(done, total)`` is called after each shard is written;
+        returning True stops the run before the next shard.
+        """
+        started = time.perf_counter()
+        if students is None:
+            students = self.data_manager.get_all_students()
+        catalog = self.data_manager.get_catalog_index()
+        tasks = [(students[start:start + self.shard_size], self.top_k)
+                 for start in range(0, len(students), self.shard_size)]
+        workers = max(1, min(self.workers, len(tasks)))
+        done = 0
+        write_seconds = 0.0
+        cancelled = bool(on_progress and on_progress(0, len(students)))
+
+        if not cancelled and workers == 1:
+            for shard, top_k in tasks:
+                write_seconds += self._write(catalog, _score_shard(self.engine, catalog, shard, top_k))
+                done += len(shard)
+                if on_progress and on_progress(done, len(students)):
+                    cancelled = True
+                    break
+        elif not cancelled:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            initargs = (type(self.engine), self.engine.weights, list(catalog.internships), catalog.version)
+            # Leaving the with-block terminates the pool, dropping pending shards
+            with context.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+                for shard_results in pool.imap_unordered(_match_shard, tasks):
+                    write_seconds += self._write(catalog, shard_results)
+                    done += len(shard_results)
+                    if on_progress and on_progress(done, len(students)):
+                        cancelled = True
+                        break
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            'students': len(students),
+            'matched': done,
+            'cancelled': cancelled,
+            'internships': len(catalog),
+            'shards': len(tasks),
+            'workers': workers,
+            'elapsed_seconds': round(elapsed, 3),
+            'students_per_second': round(done / elapsed, 1) if elapsed > 0 else None,
+            'write_seconds': round(write_seconds, 3),
+            'writes_per_second': round(done / write_seconds, 1) if write_seconds > 0 else None,
+        }
+        logger.info(f"Batch matching finished: {summary}")
+        return summary
+
+    def _write(self, catalog: CatalogIndex, shard_results: List[tuple]) -> float:
+        """Save one shard in a single transaction; returns the seconds it took."""
+        started = time.perf_counter()
+        timestamp = datetime.now().isoformat()
+        self.data_manager.add_matches_bulk([
+            {
+                'student_id': student_id,
+                'matches': [
+                    MatchRecord(catalog.internships[j], score, rank)
+                    for j, score, rank in rows
+                ],
+                'timestamp': timestamp,
+                'profile_hash': profile_hash,
+                'catalog_version': catalog.version,
+            }
+            for student_id, profile_hash, rows in shard_results
+        ])
+        return time.perf_counter() - started
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Run internship matching for every student.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--shard-size', type=int, default=2000, help='students per shard')
+    parser.add_argument('--top-k', type=int, default=10, help='matches saved per student')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    from data_manager import DataManager
+
+    runner = BatchRunner(DataManager(), workers=args.workers, shard_size=args.shard_size, top_k=args.top_k)
+    print(json.dumps(runner.run(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Matching engine benchmarks
+Times find_matches, find_live_matches and find_matches_batch on synthetic
+corpora and compares the results with a saved baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_matching --sizes small,medium
+    python -m benchmarks.bench_matching --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_matching --check benchmarks/baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import generate_internships, generate_students, generate_live_postings
+from catalog_index import CatalogIndex
+from matching_engine import MatchingEngine
+
+# name -> (students, internships)
+SIZES = {
+    'small': (1_000, 100),
+    'medium': (10_000, 1_000),
+    'large': (100_000, 10_000),
+}
+
+# Students timed one call at a time for the latency percentiles
+LATENCY_SAMPLE = 1_000
+LIVE_SAMPLE = 200
+LIVE_POSTINGS = 300
+# Students per find_matches_batch call when timing the batch path; divides
+# every size, so each call scores the same number of pairs
+BATCH_CALL_STUDENTS = 250
+
+# Metric -> True when higher is better. p99 is reported but not gated: from
+# a single run it swings too much with scheduler noise to fail a build on.
+CHECKED_METRICS = {
+    'pairs_per_second': True,
+    'p50_ms': False,
+}
+
+
+def _latency_stats(latencies: List[float], pairs_per_call: int) -> Dict[str, Any]:
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'seconds': round(total, 4),
+        'pairs_per_second': round(len(latencies) * pairs_per_call / total) if total else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 4),
+        'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 4),
+    }
+
+
+def run_size(name: str, seed: int = 0) -> Dict[str, Any]:
+    """Benchmark one size; meant to run in its own process so peak RSS is per size."""
+    n_students, n_internships = SIZES[name]
+    engine = MatchingEngine()
+    internships = generate_internships(n_internships, seed)
+    students = generate_students(n_students, n_internships, seed)
+    postings = generate_live_postings(LIVE_POSTINGS, seed)
+
+    started = time.perf_counter()
+    catalog = CatalogIndex(internships)
+    index_seconds = time.perf_counter() - started
+
+    # Warm-up: builds the catalog's lazy arrays and per-group tables
+    engine.find_matches_batch(students[:1], catalog)
+    engine.find_matches(students[0], catalog)
+    engine.find_live_matches(students[0], postings)
+
+    latencies = []
+    for student in students[:LATENCY_SAMPLE]:
+        started = time.perf_counter()
+        engine.find_matches(student, catalog)
+        latencies.append(time.perf_counter() - started)
+
+    live_latencies = []
+    for student in students[:LIVE_SAMPLE]:
+        started = time.perf_counter()
+        engine.find_live_matches(student, postings)
+        live_latencies.append(time.perf_counter() - started)
+
+    batch_latencies = []
+    for start in range(0, n_students, BATCH_CALL_STUDENTS):
+        started = time.perf_counter()
+        engine.find_matches_batch(students[start:start + BATCH_CALL_STUDENTS], catalog)
+        batch_latencies.append(time.perf_counter() - started)
+    batch = _latency_stats(batch_latencies, BATCH_CALL_STUDENTS * n_internships)
+    batch['students_per_second'] = round(n_students / batch['seconds'], 1)
+
+    return {
+        'students': n_students,
+        'internships': n_internships,
+        'index_seconds': round(index_seconds, 4),
+        'find_matches': _latency_stats(latencies, n_internships),
+        'find_live_matches': _latency_stats(live_latencies, LIVE_POSTINGS),
+        'batch': batch,
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1),
+    }
+
+
+def run(sizes: List[str], seed: int = 0) -> Dict[str, Any]:
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for name in sizes:
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(run_size, (name, seed))
+        print(f"{name}: {json.dumps(results[name])}", file=sys.stderr)
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'sizes': results,
+    }
+
+
+def check(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Metrics more than ``tolerance`` (a fraction) worse than the baseline."""
+    failures = []
+    for name, result in report['sizes'].items():
+        expected = baseline['sizes'].get(name)
+        if not expected:
+            continue
+        for section in ('find_matches', 'find_live_matches', 'batch'):
+            for metric, higher_is_better in CHECKED_METRICS.items():
+                now = result[section].get(metric)
+                then = expected.get(section, {}).get(metric)
+                if not now or not then:
+                    continue
+                change = now / then - 1 if higher_is_better else then / now - 1
+                if change < -tolerance:
+                    failures.append(f"{name}.{section}.{metric}: {now} vs baseline {then} ({change:+.0%})")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the matching engine on synthetic data.')
+    parser.add_argument('--sizes', default='small,medium',
+                        help=f"comma-separated subset of {', '.join(SIZES)} (default: small,medium)")
+    parser.add_argument('--seed', type=int, default=0, help='synthetic data seed')
+    parser.add_argument('--save-baseline', metavar='PATH', help='write the report as the new baseline')
+    parser.add_argument('--check', metavar='PATH', help='fail if slower than this baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown as a fraction of the baseline (default: 0.25)')
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    report = run(sizes, args.seed)
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        failures = check(report, baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
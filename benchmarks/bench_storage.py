@@ -0,0 +1,78 @@
+"""
+Match persistence benchmark
+Times saving a cohort's match lists one student per transaction (add_match in
+a loop, as the batch job used to) against add_matches_bulk, on a throwaway
+database so the configured one is never touched.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_storage --students 5000 --chunk-sizes 100,1000,5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List, Dict, Any, Optional
+
+
+def _rows(students: List[Dict[str, Any]], matches: List[list], version: int) -> List[Dict[str, Any]]:
+    return [
+        {'student_id': student['id'], 'matches': student_matches, 'timestamp': 'bench',
+         'profile_hash': '', 'catalog_version': version}
+        for student, student_matches in zip(students, matches)
+    ]
+
+
+def _throughput(rows: int, seconds: float) -> Dict[str, Any]:
+    return {'seconds': round(seconds, 4), 'students_per_second': round(rows / seconds, 1) if seconds else None}
+
+
+def run(n_students: int, chunk_sizes: List[int], top_k: int = 10, seed: int = 0) -> Dict[str, Any]:
+    # The database path is read when db_config is imported
+    from benchmarks.synthetic import generate_students
+    from data_manager import DataManager
+    from matching_engine import MatchingEngine
+
+    data_manager = DataManager()
+    catalog = data_manager.get_catalog_index()
+    for student in generate_students(n_students, len(catalog), seed):
+        data_manager.add_student(student)
+    students = data_manager.get_all_students()
+    matches = MatchingEngine().find_matches_batch(students, catalog, top_k=top_k, include_reasoning=False)
+    rows = _rows(students, matches, catalog.version)
+
+    started = time.perf_counter()
+    for row in rows:
+        data_manager.add_match(row)
+    report = {'students': len(rows), 'top_k': top_k, 'add_match': _throughput(len(rows), time.perf_counter() - started)}
+
+    # The runs exist by now, so every bulk pass exercises the UPSERT path
+    for chunk_size in chunk_sizes:
+        started = time.perf_counter()
+        data_manager.add_matches_bulk(rows, chunk_size=chunk_size)
+        result = _throughput(len(rows), time.perf_counter() - started)
+        result['speedup'] = round(report['add_match']['seconds'] / result['seconds'], 1)
+        report[f"add_matches_bulk[{chunk_size}]"] = result
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark saving match lists.')
+    parser.add_argument('--students', type=int, default=5000, help='students saved per pass')
+    parser.add_argument('--chunk-sizes', default='100,1000,5000', help='comma-separated add_matches_bulk chunk sizes')
+    parser.add_argument('--top-k', type=int, default=10, help='matches saved per student')
+    parser.add_argument('--seed', type=int, default=0, help='synthetic data seed')
+    args = parser.parse_args(argv)
+
+    chunk_sizes = [int(size) for size in args.chunk_sizes.split(',') if size.strip()]
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['SQLITE_DB_PATH'] = os.path.join(directory, 'bench.db')
+        report = run(args.students, chunk_sizes, args.top_k, args.seed)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
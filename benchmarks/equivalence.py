@@ -0,0 +1,45 @@
+"""
+Reference-vs-optimized equivalence on synthetic corpora
+Runs ReferenceEngine and MatchingEngine (single and batch paths) over
+generated cohorts and fails when any ranking drifts beyond the tolerances.
+
+Usage (from the repository root):
+    python -m benchmarks.equivalence --students 300 --internships 1000 --seeds 0,1,2
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from benchmarks.synthetic import generate_internships, generate_students
+from matching_engine import MatchingEngine
+from shadow import ShadowRunner, Tolerances
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare the optimized engine with the reference scorer.')
+    parser.add_argument('--students', type=int, default=300, help='students per corpus')
+    parser.add_argument('--internships', type=int, default=1000, help='internships per corpus')
+    parser.add_argument('--seeds', default='0,1,2', help='comma-separated corpus seeds')
+    parser.add_argument('--top-k', type=int, default=10, help='matches compared per student')
+    parser.add_argument('--score-tolerance', type=float, default=0.0, help='max rounded-score difference')
+    parser.add_argument('--min-overlap', type=float, default=1.0, help='min shared share of the top-k')
+    parser.add_argument('--rank-tolerance', type=int, default=0, help='max rank difference')
+    args = parser.parse_args(argv)
+
+    tolerances = Tolerances(score=args.score_tolerance, overlap=args.min_overlap, rank=args.rank_tolerance)
+    runner = ShadowRunner(None, MatchingEngine(), tolerances=tolerances)
+    report = {}
+    for seed in (int(s) for s in args.seeds.split(',') if s.strip()):
+        internships = generate_internships(args.internships, seed)
+        students = generate_students(args.students, args.internships, seed)
+        report[f"seed {seed}"] = runner.run_corpus(students, internships, top_k=args.top_k)
+
+    print(json.dumps(report, indent=2))
+    failed = sum(paths[path]['failed'] for paths in report.values() for path in paths)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
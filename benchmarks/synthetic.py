@@ -0,0 +1,101 @@
+"""
+Synthetic corpora for benchmarks
+Deterministic students, internships and live postings with the same fields as
+``DataManager._get_sample_internships()`` and the ``students`` table. The
+vocabularies start from the sample catalog and grow with the corpus, so large
+catalogs keep a realistic number of distinct skills, sectors and cities.
+"""
+
+import random
+from typing import List, Dict, Any
+
+from data_manager import DataManager
+
+# The seed catalog, read without opening the database
+_SAMPLE = DataManager.__new__(DataManager)._get_sample_internships()
+
+SKILLS = sorted({skill for internship in _SAMPLE for skill in internship['required_skills']})
+SECTORS = sorted({internship['sector'] for internship in _SAMPLE})
+LOCATIONS = sorted({internship['location'] for internship in _SAMPLE}) + ['Ahmedabad', 'Jaipur', 'Lucknow', 'Patna']
+ORGANIZATIONS = sorted({internship['organization'] for internship in _SAMPLE})
+DURATIONS = ['3 months', '4 months', '6 months', '8 months']
+EDUCATION_LEVELS = ['high school', '12th', 'diploma', 'undergraduate', 'bachelor', 'postgraduate', 'master', 'phd']
+CATEGORIES = ['General', 'OBC', 'SC', 'ST', 'EWS']
+EXPERIENCE = ['fresher', '0-6 months', '6-12 months', '1-2 years', '2+ years']
+PLATFORMS = ['indeed', 'linkedin', 'naukri']
+
+
+def _skill_pool(size: int) -> List[str]:
+    """Sample skills plus numbered variants, about one distinct skill per ten internships."""
+    extra = max(0, size // 10 - len(SKILLS))
+    return SKILLS + [f"{SKILLS[k % len(SKILLS)]} {k // len(SKILLS) + 2}" for k in range(extra)]
+
+
+def generate_internships(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    skills = _skill_pool(count)
+    internships = []
+    for i in range(count):
+        template = _SAMPLE[i % len(_SAMPLE)]
+        internships.append({
+            'id': f"INT{i + 1:06d}",
+            'title': template['title'],
+            'organization': rng.choice(ORGANIZATIONS),
+            'sector': rng.choice(SECTORS),
+            'location': rng.choice(LOCATIONS),
+            'duration': rng.choice(DURATIONS),
+            'stipend': rng.randrange(10000, 50001, 1000),
+            'required_skills': rng.sample(skills, rng.choice([0, 3, 4, 4, 4, 5])),
+            'education_requirement': rng.choice(['undergraduate'] * 6 + ['12th', 'diploma', 'postgraduate', 'phd']),
+            'description': template['description'],
+            'capacity': rng.choice([10, 15, 20, 25, 30, 50, 75, 100]),
+            'affirmative_action_required': rng.random() < 0.3,
+            'apply_url': template['apply_url'],
+        })
+    return internships
+
+
+def generate_students(count: int, catalog_size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed + 1)
+    skills = _skill_pool(catalog_size)
+    students = []
+    for i in range(count):
+        students.append({
+            'id': f"STU{i + 1:07d}",
+            'name': f"Student {i + 1}",
+            'email': f"student{i + 1}@example.com",
+            'phone': f"9{rng.randrange(10 ** 9):09d}",
+            'age': rng.randint(18, 29),
+            'education': rng.choice(EDUCATION_LEVELS),
+            'college': f"College {rng.randint(1, 500)}",
+            'cgpa': round(rng.uniform(5.0, 10.0), 2),
+            'skills': rng.sample(skills, rng.randint(2, 8)),
+            'interests': rng.sample(SECTORS, rng.randint(0, 3)),
+            'location_preference': rng.choice(['any'] + [location.lower() for location in LOCATIONS]),
+            'location_type': rng.choice(['urban', 'rural']),
+            'category': rng.choice(CATEGORIES),
+            'experience': rng.choice(EXPERIENCE),
+            'past_participation': rng.random() < 0.2,
+            'created_at': '2025-01-01T00:00:00',
+        })
+    return students
+
+
+def generate_live_postings(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Scraped-posting dicts shaped like InternshipFetcher results."""
+    rng = random.Random(seed + 2)
+    postings = []
+    for i in range(count):
+        template = rng.choice(_SAMPLE)
+        words = rng.sample(SKILLS + SECTORS, 12)
+        postings.append({
+            'id': f"LIVE{i + 1:06d}",
+            'title': template['title'],
+            'company': rng.choice(ORGANIZATIONS),
+            'location': rng.choice(LOCATIONS),
+            'description': template['description'] + ' ' + ' '.join(words),
+            'skills_extracted': rng.sample(SKILLS, rng.randint(0, 6)),
+            'platform': rng.choice(PLATFORMS),
+            'apply_url': template['apply_url'],
+        })
+    return postings
@@ -0,0 +1,151 @@
+"""
+Compiled internship catalog
+Precomputes the per-internship matching features once per catalog version so
+scoring a (student, internship) pair is a handful of lookups.
+"""
+
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from relevance import DocumentFrequencies
+
+EDUCATION_HIERARCHY = {
+    'high school': 1,
+    '12th': 2,
+    'diploma': 3,
+    'undergraduate': 4,
+    'bachelor': 4,
+    'postgraduate': 5,
+    'master': 5,
+    'phd': 6
+}
+
+MAX_EDUCATION_LEVEL = max(EDUCATION_HIERARCHY.values())
+
+
+class CatalogIndex:
+    """Internship catalog with interned skills and pre-normalized fields.
+
+    Row ``j`` of every per-internship list describes ``internships[j]``:
+    required skills as an integer bitset over interned skill ids, the length
+    of the original ``required_skills`` list, the resolved education level,
+    and codes into the de-duplicated, lowercased location and sector lists.
+
+    ``skill_postings`` maps each skill id to the rows requiring it, and
+    ``groups`` buckets rows by their non-skill features so the engine can
+    bound a whole bucket's score at once.
+    """
+
+    def __init__(self, internships: List[Dict[str, Any]], version: Optional[int] = None):
+        self.internships = list(internships)
+        self.version = version
+        # Internship id -> row, for turning saved matches back into rows
+        self.positions: Dict[str, int] = {
+            internship.get('id'): j for j, internship in enumerate(self.internships)
+        }
+
+        self.skill_ids: Dict[str, int] = {}
+        self.skill_masks: List[int] = []
+        self.required_counts: List[int] = []
+        self.education_levels: List[int] = []
+        self.location_codes: List[int] = []
+        self.sector_codes: List[int] = []
+        self.affirmative: List[bool] = []
+        self.locations: List[str] = []
+        self.sectors: List[str] = []
+        # Inverted index: skill id -> rows that require it, in catalog order
+        self.skill_postings: List[List[int]] = []
+        # Rows sharing every non-skill feature score identically for a given
+        # student unless they share skills with them
+        self.groups: List[tuple] = []
+        self.group_members: List[List[int]] = []
+        self.group_of: List[int] = []
+
+        location_ids: Dict[str, int] = {}
+        sector_ids: Dict[str, int] = {}
+        group_ids: Dict[tuple, int] = {}
+        for j, internship in enumerate(self.internships):
+            required = internship.get('required_skills') or []
+            self.required_counts.append(len(required))
+            mask = 0
+            for skill in required:
+                if skill not in self.skill_ids:
+                    self.skill_ids[skill] = len(self.skill_postings)
+                    self.skill_postings.append([])
+                skill_id = self.skill_ids[skill]
+                if not mask >> skill_id & 1:
+                    self.skill_postings[skill_id].append(j)
+                mask |= 1 << skill_id
+            self.skill_masks.append(mask)
+
+            education = (internship.get('education_requirement') or '').lower()
+            self.education_levels.append(EDUCATION_HIERARCHY.get(education, 0))
+
+            location = (internship.get('location') or '').lower()
+            if location not in location_ids:
+                location_ids[location] = len(self.locations)
+                self.locations.append(location)
+            self.location_codes.append(location_ids[location])
+
+            sector = (internship.get('sector') or '').lower()
+            if sector not in sector_ids:
+                sector_ids[sector] = len(self.sectors)
+                self.sectors.append(sector)
+            self.sector_codes.append(sector_ids[sector])
+
+            self.affirmative.append(bool(internship.get('affirmative_action_required', False)))
+
+            group = (bool(required), self.education_levels[j], self.location_codes[j],
+                     self.sector_codes[j], self.affirmative[j])
+            if group not in group_ids:
+                group_ids[group] = len(self.groups)
+                self.groups.append(group)
+                self.group_members.append([])
+            self.group_of.append(group_ids[group])
+            self.group_members[group_ids[group]].append(j)
+
+        self._arrays: Optional[Dict[str, Any]] = None
+        self._description_frequencies: Optional[DocumentFrequencies] = None
+
+    def __len__(self) -> int:
+        return len(self.internships)
+
+    def skill_mask(self, skills: List[str]) -> int:
+        """Bitset of the given skills; skills no internship requires are dropped."""
+        mask = 0
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
+
+    @property
+    def arrays(self) -> Dict[str, Any]:
+        """NumPy views of the catalog for batch scoring, built on first use."""
+        if self._arrays is None:
+            required_counts = np.array(self.required_counts, dtype=np.float64)
+            self._arrays = {
+                'postings': [np.array(p, dtype=np.int64) for p in self.skill_postings],
+                'required_counts': required_counts,
+                'has_required': required_counts > 0,
+                'education_levels': np.array(self.education_levels, dtype=np.int64),
+                'location_codes': np.array(self.location_codes, dtype=np.int64),
+                'sector_codes': np.array(self.sector_codes, dtype=np.int64),
+                'affirmative': np.array(self.affirmative, dtype=bool),
+            }
+        return self._arrays
+
+    @property
+    def description_frequencies(self) -> DocumentFrequencies:
+        """Term document frequencies of the catalog descriptions, built on first use.
+
+        Live relevance scoring adds these to a scraped batch's own counts so
+        IDF weights stay meaningful when only a handful of postings came back.
+        """
+        if self._description_frequencies is None:
+            self._description_frequencies = DocumentFrequencies(
+                f"{internship.get('title', '')} {internship.get('description', '')}"
+                for internship in self.internships
+            )
+        return self._description_frequencies
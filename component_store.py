@@ -0,0 +1,208 @@
+"""
+Per-criterion component store
+Keeps the unweighted criterion scores of each student's candidate top
+choices on disk, so the cohort can be re-ranked under different weights with
+a matrix-vector product instead of a full rematch.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from catalog_index import CatalogIndex
+from db_config import DB_PATH
+from matching_engine import MatchingEngine, CRITERIA, SCORING_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_weights(base: Dict[str, float], overrides: Dict[str, float]) -> Dict[str, float]:
+    """Apply weight overrides, rescaling the other criteria so the total is unchanged.
+
+    ``{'location_preference': 0.25}`` reads as "location counts 25%"; the
+    remaining criteria share what is left in their original proportions.
+    """
+    unknown = sorted(set(overrides) - set(CRITERIA))
+    if unknown:
+        raise ValueError(f"Unknown criteria: {', '.join(unknown)}")
+    overrides = {key: float(value) for key, value in overrides.items()}
+    if any(value < 0 for value in overrides.values()):
+        raise ValueError("Weights must not be negative")
+
+    total = sum(base[key] for key in CRITERIA)
+    remaining = total - sum(overrides.values())
+    if remaining < -1e-9:
+        raise ValueError(f"Overrides add up to more than {total:g}")
+    rest = sum(base[key] for key in CRITERIA if key not in overrides)
+    scale = max(remaining, 0.0) / rest if rest else 0.0
+    return {key: overrides[key] if key in overrides else base[key] * scale for key in CRITERIA}
+
+
+class ComponentStore:
+    """Candidate component rows for the whole cohort, stored as ``<path>.npz`` plus ``<path>.json``.
+
+    Internships whose criterion scores for a student agree on everything but
+    skills can only be told apart by the skills score, so under any
+    non-negative weights the student's top choice is the first column with
+    the best skills score in its group, or the group's first column when
+    skills weigh nothing. Only those columns are kept, in CSR form:
+    ``columns[indptr[i]:indptr[i + 1]]`` are student ``i``'s candidates and
+    ``components`` their criterion scores. The sidecar records the catalog
+    and profile versions the store was built against.
+    """
+
+    def __init__(self, data_manager, engine: Optional[MatchingEngine] = None,
+                 path: Optional[str] = None, chunk_size: int = 256):
+        self.data_manager = data_manager
+        self.engine = engine or MatchingEngine()
+        self.path = path or os.path.join(os.path.dirname(DB_PATH), 'match_components')
+        self.chunk_size = chunk_size
+
+    def load_meta(self) -> Dict[str, Any] | None:
+        try:
+            with open(self.path + '.json') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def current_meta(self) -> Optional[Dict[str, Any]]:
+        """Sidecar of the stored scores if they match the current catalog and profiles, else None."""
+        meta = self.load_meta()
+        if (not meta or meta.get('scoring_version') != SCORING_VERSION
+                or meta['catalog_version'] != self.data_manager.get_catalog_version()
+                or meta.get('profiles_version') != self.data_manager.get_profiles_version()):
+            return None
+        return meta
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Build from the current database; run it as a job, it scores every pair."""
+        # Versions first: a change made while loading leaves the result stale, not wrong
+        profiles_version = self.data_manager.get_profiles_version()
+        catalog = self.data_manager.get_catalog_index()
+        return self.build(self.data_manager.get_all_students(), catalog, profiles_version)
+
+    def build(self, students: List[Dict[str, Any]], catalog: CatalogIndex,
+              profiles_version: Optional[int] = None) -> Dict[str, Any]:
+        """Score every pair chunk by chunk, keep each student's candidates, then swap the files in."""
+        started = time.perf_counter()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+
+        counts, columns, components = [], [], []
+        if len(catalog):
+            for start in range(0, len(students), self.chunk_size):
+                block = self.engine.component_block(students[start:start + self.chunk_size], catalog)
+                keep = self._candidates(block)
+                rows, cols = np.nonzero(keep)
+                counts.append(keep.sum(axis=1))
+                columns.append(cols.astype(np.int32))
+                components.append(block[rows, cols])
+        counts = np.concatenate(counts) if counts else np.zeros(len(students), dtype=np.int64)
+        indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        columns = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int32)
+        components = (np.concatenate(components) if components
+                      else np.zeros((0, len(CRITERIA)), dtype=np.float32))
+        np.savez(tmp_path + '.npz', indptr=indptr, columns=columns, components=components)
+
+        meta = {
+            'catalog_version': catalog.version,
+            'profiles_version': profiles_version,
+            'scoring_version': SCORING_VERSION,
+            'students': len(students),
+            'candidates': int(len(columns)),
+            'internship_ids': [internship['id'] for internship in catalog.internships],
+            'criteria': list(CRITERIA),
+            'built_seconds': round(time.perf_counter() - started, 3),
+        }
+        with open(tmp_path + '.json', 'w') as f:
+            json.dump(meta, f)
+        # Scores first: a reader pairing the new scores with the old sidecar
+        # sees a version mismatch and asks for a rebuild
+        os.replace(tmp_path + '.npz', self.path + '.npz')
+        os.replace(tmp_path + '.json', self.path + '.json')
+        logger.info(f"Kept {meta['candidates']} of {len(students) * len(catalog)} pairs "
+                    f"for the component store in {meta['built_seconds']}s")
+        return meta
+
+    @staticmethod
+    def _candidates(block: np.ndarray) -> np.ndarray:
+        """Mask of the columns each student's top choice can come from, for a ``(s, n, CRITERIA)`` block."""
+        skills_at = CRITERIA.index('skills_match')
+        skills = block[:, :, skills_at]
+        others = [block[:, :, c] for c in range(len(CRITERIA)) if c != skills_at]
+        columns = np.broadcast_to(np.arange(skills.shape[1]), skills.shape)
+        # Group on the other criteria (lexsort's last key sorts first), then
+        # order each group by best skills or by column
+        by_skills = np.lexsort([columns, -skills] + others[::-1], axis=-1)
+        by_column = np.lexsort([columns] + others[::-1], axis=-1)
+
+        grouped = np.stack([np.take_along_axis(other, by_skills, axis=1) for other in others])
+        starts = np.ones(skills.shape, dtype=bool)
+        starts[:, 1:] = (grouped[:, :, 1:] != grouped[:, :, :-1]).any(axis=0)
+        rows = np.nonzero(starts)[0]
+        keep = np.zeros(skills.shape, dtype=bool)
+        keep[rows, by_skills[starts]] = True
+        keep[rows, by_column[starts]] = True
+        return keep
+
+    def open(self):
+        """``(indptr, columns, components)`` of the stored candidates."""
+        with np.load(self.path + '.npz') as stored:
+            return stored['indptr'], stored['columns'], stored['components']
+
+    def best_choices(self, weights: Dict[str, float]):
+        """Top internship column and its score for every student under ``weights``."""
+        indptr, columns, components = self.open()
+        students = len(indptr) - 1
+        if not len(columns):
+            return np.zeros(students, dtype=np.int64), np.zeros(students, dtype=np.float32)
+        vector = np.array([weights[key] for key in CRITERIA], dtype=np.float32) * 100
+        scores = components @ vector
+        starts = indptr[:-1]
+        best_scores = np.maximum.reduceat(scores, starts)
+        # Candidates are in column order, so the first maximum is the same
+        # tie-break as argmax over the full row
+        owner = np.repeat(np.arange(students), np.diff(indptr))
+        positions = np.where(scores == best_scores[owner], np.arange(len(scores)), len(scores))
+        return columns[np.minimum.reduceat(positions, starts)].astype(np.int64), best_scores
+
+    def what_if(self, base: Dict[str, float], weights: Dict[str, float], meta: Dict[str, Any],
+                top: int = 10) -> Dict[str, Any]:
+        """Compare every student's top choice under ``base`` and ``weights``.
+
+        ``meta`` is the sidecar from ``current_meta``; the comparison is two
+        products over the stored candidates.
+        """
+        started = time.perf_counter()
+        base_best, base_scores = self.best_choices(base)
+        new_best, new_scores = self.best_choices(weights)
+        finished = time.perf_counter()
+
+        internship_ids = meta['internship_ids']
+        popular = []
+        if internship_ids and len(new_best):
+            base_counts = np.bincount(base_best, minlength=len(internship_ids))
+            new_counts = np.bincount(new_best, minlength=len(internship_ids))
+            popular = [
+                {'internship_id': internship_ids[j], 'baseline': int(base_counts[j]), 'what_if': int(new_counts[j])}
+                for j in np.argsort(-new_counts, kind='stable')[:top]
+            ]
+        has_rows = bool(internship_ids) and len(new_best) > 0
+        return {
+            'students': len(new_best),
+            'internships': len(internship_ids),
+            'top_choice_changed': int((base_best != new_best).sum()) if has_rows else 0,
+            'mean_top_score': {
+                'baseline': round(float(base_scores.mean()), 2) if has_rows else None,
+                'what_if': round(float(new_scores.mean()), 2) if has_rows else None,
+            },
+            'top_internships': popular,
+            'timings': {
+                'rank_seconds': round(finished - started, 3),
+            },
+        }
@@ -2,17 +2,29 @@ import json
 import os
 import logging
 import uuid
+from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from db_config import get_connection, init_db, placeholder, fetch_count
+from catalog_index import CatalogIndex
+from records import InternshipRecord, MatchRecord, StudentRecord
 from werkzeug.security import generate_password_hash
 
 logger = logging.getLogger(__name__)
 
+# Students per executemany batch in add_matches_bulk
+MATCH_WRITE_CHUNK = int(os.environ.get('MATCH_WRITE_CHUNK', '1000'))
+
+
+def like_prefix(search: str) -> str:
+    """A LIKE pattern (for ``ESCAPE '\\'``) matching values that start with ``search`` literally."""
+    return search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
 
 class DataManager:
     """Manages data storage and retrieval using SQLite database"""
 
     def __init__(self):
+        self._catalog_index = None
         self._ensure_db()
 
     def _ensure_db(self):
@@ -77,6 +89,8 @@ class DataManager:
                             internship.get('apply_url', ''),
                         )
                     )
+                    self._save_internship_skills(cursor, internship['id'], internship['required_skills'])
+                self._bump_catalog_version(cursor)
                 conn.commit()
             else:
                 # Add any new internships that don't exist yet
@@ -87,8 +101,10 @@ class DataManager:
                         existing_ids.add(row['id'])
                     else:
                         existing_ids.add(row[0])
+                added = False
                 for internship in self._get_sample_internships():
                     if internship['id'] not in existing_ids:
+                        added = True
                         cursor.execute(
                             f"""INSERT INTO internships
                                (id, title, organization, sector, location, duration,
@@ -107,11 +123,14 @@ class DataManager:
                                 internship.get('apply_url', ''),
                             )
                         )
+                        self._save_internship_skills(cursor, internship['id'], internship['required_skills'])
+                if added:
+                    self._bump_catalog_version(cursor)
                 conn.commit()
         finally:
             conn.close()
 
-    def get_all_students(self) -> List[Dict[str, Any]]:
+    def get_all_students(self) -> List[StudentRecord]:
         conn = get_connection()
         try:
             cursor = conn.cursor()
@@ -123,12 +142,41 @@ class DataManager:
                 d['skills'] = json.loads(d['skills']) if d['skills'] else []
                 d['interests'] = json.loads(d['interests']) if d['interests'] else []
                 d['past_participation'] = bool(d['past_participation'])
-                result.append(d)
+                result.append(StudentRecord.from_row(d))
             return result
         finally:
             conn.close()
 
-    def get_student(self, student_id: str) -> Dict[str, Any] | None:
+    def get_student_ids(self) -> List[str]:
+        """Ids of every student, without loading their profiles."""
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM students")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_students_by_ids(self, student_ids: List[str]) -> List[StudentRecord]:
+        """Profiles of the given students, skipping ids that no longer exist."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM students WHERE id IN (SELECT value FROM json_each({p}))",
+                           (json.dumps(list(student_ids)),))
+            result = []
+            for row in cursor.fetchall():
+                d = dict(row)
+                d['skills'] = json.loads(d['skills']) if d['skills'] else []
+                d['interests'] = json.loads(d['interests']) if d['interests'] else []
+                d['past_participation'] = bool(d['past_participation'])
+                result.append(StudentRecord.from_row(d))
+            return result
+        finally:
+            conn.close()
+
+    def get_student(self, student_id: str) -> StudentRecord | None:
         conn = get_connection()
         p = placeholder()
         try:
@@ -141,12 +189,12 @@ class DataManager:
                 d['interests'] = json.loads(d['interests']) if d['interests'] else []
                 d['past_participation'] = bool(d['past_participation'])
                 d['email_verified'] = bool(d.get('email_verified', 0))
-                return d
+                return StudentRecord.from_row(d)
             return None
         finally:
             conn.close()
 
-    def get_student_by_email(self, email: str) -> Dict[str, Any] | None:
+    def get_student_by_email(self, email: str) -> StudentRecord | None:
         conn = get_connection()
         p = placeholder()
         try:
@@ -159,7 +207,7 @@ class DataManager:
                 d['interests'] = json.loads(d['interests']) if d['interests'] else []
                 d['past_participation'] = bool(d['past_participation'])
                 d['email_verified'] = bool(d.get('email_verified', 0))
-                return d
+                return StudentRecord.from_row(d)
             return None
         finally:
             conn.close()
@@ -188,17 +236,19 @@ class DataManager:
                     student_data.get('category'),
                     student_data.get('experience'),
                     1 if student_data.get('past_participation') else 0,
-                    student_data.get('created_at'),
+                    student_data.get('created_at') or datetime.now().isoformat(),
                     student_data.get('password', ''),
                     1 if student_data.get('email_verified') else 0,
                     student_data.get('verification_token', ''),
                 )
             )
+            self._save_student_skills(cursor, student_data['id'], student_data.get('skills', []),
+                                      student_data.get('interests', []))
             conn.commit()
         finally:
             conn.close()
 
-    def get_all_internships(self) -> List[Dict[str, Any]]:
+    def get_all_internships(self) -> List[InternshipRecord]:
         conn = get_connection()
         try:
             cursor = conn.cursor()
@@ -209,48 +259,766 @@ class DataManager:
                 d = dict(row)
                 d['required_skills'] = json.loads(d['required_skills']) if d['required_skills'] else []
                 d['affirmative_action_required'] = bool(d['affirmative_action_required'])
-                result.append(d)
+                result.append(InternshipRecord.from_row(d))
             return result
         finally:
             conn.close()
 
-    def get_all_matches(self) -> List[Dict[str, Any]]:
+    def get_catalog_version(self) -> int:
+        """Counter bumped by every internship insert, update and delete."""
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM catalog_meta WHERE key = 'version'")
+            return fetch_count(cursor)
+        finally:
+            conn.close()
+
+    def get_profiles_version(self) -> int:
+        """Counter bumped by triggers whenever a student's scored fields change, or a student comes or goes."""
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM catalog_meta WHERE key = 'profiles_version'")
+            return fetch_count(cursor)
+        finally:
+            conn.close()
+
+    def get_identity_revision(self, kind: str, identity_id: str) -> int | None:
+        """Trigger-maintained revision of a 'student' or 'admin' row; None once it is deleted."""
+        table = {'student': 'students', 'admin': 'admins'}[kind]
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT revision FROM {table} WHERE id = {p}", (identity_id,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def get_catalog_index(self) -> CatalogIndex:
+        """Compiled matching index for the current catalog, rebuilt only when the version changes."""
+        version = self.get_catalog_version()
+        index = self._catalog_index
+        if index is None or index.version != version:
+            index = CatalogIndex(self.get_all_internships(), version=version)
+            self._catalog_index = index
+        return index
+
+    # Keyset pagination: each list is ordered by an indexed key and a page
+    # starts after the last key of the previous one, so a page costs the
+    # same on the first screen as on the last. Each returns (rows, next_key),
+    # next_key being None on the last page.
+
+    def list_students(self, after: int | None = None, limit: int = 50,
+                      search: str = '') -> tuple[List[StudentRecord], int | None]:
+        """Newest registrations first; ``search`` matches the start of the name or email."""
         conn = get_connection()
+        p = placeholder()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM matches")
+            where, params = [], []
+            if after is not None:
+                where.append(f"rowid < {p}")
+                params.append(after)
+            if search:
+                where.append(f"(name LIKE {p} ESCAPE '\\' OR email LIKE {p} ESCAPE '\\')")
+                params += [like_prefix(search)] * 2
+            cursor.execute(
+                f"""SELECT rowid AS page_key, * FROM students
+                   {'WHERE ' + ' AND '.join(where) if where else ''}
+                   ORDER BY rowid DESC LIMIT {p}""",
+                params + [limit + 1]
+            )
             rows = cursor.fetchall()
-            result = []
-            for row in rows:
+            students = []
+            for row in rows[:limit]:
                 d = dict(row)
-                d['matches'] = json.loads(d['matches']) if d['matches'] else []
-                result.append(d)
-            return result
+                d.pop('page_key')
+                d['skills'] = json.loads(d['skills']) if d['skills'] else []
+                d['interests'] = json.loads(d['interests']) if d['interests'] else []
+                d['past_participation'] = bool(d['past_participation'])
+                students.append(StudentRecord.from_row(d))
+            return students, rows[limit - 1]['page_key'] if len(rows) > limit else None
+        finally:
+            conn.close()
+
+    def list_match_runs(self, after: int | None = None, limit: int = 50,
+                        search: str = '') -> tuple[List[Dict[str, Any]], int | None]:
+        """Match runs, newest first, with the student's name and top match joined in SQL.
+
+        A student's run keeps its id when the list is saved again, so the
+        order is that of each student's first match. ``search`` matches the
+        start of the student's name or email.
+        """
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            where, params = [], []
+            if after is not None:
+                where.append(f"m.id < {p}")
+                params.append(after)
+            if search:
+                where.append(f"(s.name LIKE {p} ESCAPE '\\' OR s.email LIKE {p} ESCAPE '\\')")
+                params += [like_prefix(search)] * 2
+            cursor.execute(
+                f"""SELECT m.id, m.student_id, m.timestamp, s.name AS student_name,
+                          i.title AS top_title, r.score AS top_score,
+                          (SELECT COUNT(*) FROM match_results c WHERE c.run_id = m.id) AS match_count
+                   FROM matches m
+                   JOIN students s ON s.id = m.student_id
+                   LEFT JOIN match_results r ON r.run_id = m.id AND r.rank = 1
+                   LEFT JOIN internships i ON i.id = r.internship_id
+                   {'WHERE ' + ' AND '.join(where) if where else ''}
+                   ORDER BY m.id DESC LIMIT {p}""",
+                params + [limit + 1]
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+            return rows[:limit], rows[limit - 1]['id'] if len(rows) > limit else None
+        finally:
+            conn.close()
+
+    def list_internships(self, after: int | None = None, limit: int = 50,
+                         search: str = '') -> tuple[List[InternshipRecord], int | None]:
+        """Internships in catalog order; ``search`` matches the start of the title, organization or sector."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            where, params = [], []
+            if after is not None:
+                where.append(f"rowid > {p}")
+                params.append(after)
+            if search:
+                where.append(f"(title LIKE {p} ESCAPE '\\' OR organization LIKE {p} ESCAPE '\\'"
+                             f" OR sector LIKE {p} ESCAPE '\\')")
+                params += [like_prefix(search)] * 3
+            cursor.execute(
+                f"""SELECT rowid AS page_key, * FROM internships
+                   {'WHERE ' + ' AND '.join(where) if where else ''}
+                   ORDER BY rowid LIMIT {p}""",
+                params + [limit + 1]
+            )
+            rows = cursor.fetchall()
+            internships = []
+            for row in rows[:limit]:
+                d = dict(row)
+                d.pop('page_key')
+                d['required_skills'] = json.loads(d['required_skills']) if d['required_skills'] else []
+                d['affirmative_action_required'] = bool(d['affirmative_action_required'])
+                internships.append(InternshipRecord.from_row(d))
+            return internships, rows[limit - 1]['page_key'] if len(rows) > limit else None
+        finally:
+            conn.close()
+
+    def list_activity(self, after: tuple | None = None,
+                      limit: int = 50) -> tuple[List[Dict[str, Any]], tuple | None]:
+        """Registrations and top matches, newest first, for the admin log.
+
+        Rows are ``{'kind', 'key', 'timestamp', 'name', 'detail', 'score'}``:
+        a 'registration' carries the student's email as detail, a 'match' the
+        title of the student's top internship. The page key is the last row's
+        ``(timestamp, kind, key)``. Each half is read in timestamp order from
+        its index and the two are merged, so a page never reads the rest of
+        the log.
+        """
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            where, params = {}, {}
+            for kind, (timestamp, key) in (('registration', ('s.created_at', 's.rowid')),
+                                           ('match', ('m.timestamp', 'm.id'))):
+                if after is None:
+                    where[kind], params[kind] = '', []
+                elif kind == after[1]:
+                    where[kind], params[kind] = f"WHERE ({timestamp}, {key}) < ({p}, {p})", [after[0], after[2]]
+                else:
+                    # Equal timestamps list registrations before matches
+                    op = '<=' if kind < after[1] else '<'
+                    where[kind], params[kind] = f"WHERE {timestamp} {op} {p}", [after[0]]
+            cursor.execute(
+                f"""SELECT 'registration' AS kind, s.rowid AS key, s.created_at AS timestamp,
+                          s.name AS name, s.email AS detail, NULL AS score
+                   FROM students s {where['registration']}
+                   UNION ALL
+                   SELECT 'match', m.id, m.timestamp, s.name, i.title, r.score
+                   FROM matches m
+                   JOIN match_results r ON r.run_id = m.id AND r.rank = 1
+                   JOIN internships i ON i.id = r.internship_id
+                   LEFT JOIN students s ON s.id = m.student_id
+                   {where['match']}
+                   ORDER BY timestamp DESC, kind DESC, key DESC LIMIT {p}""",
+                params['registration'] + params['match'] + [limit + 1]
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+            last = rows[limit - 1] if len(rows) > limit else None
+            return rows[:limit], (last['timestamp'], last['kind'], last['key']) if last else None
+        finally:
+            conn.close()
+
+    def get_internships_requiring(self, skills: List[str]) -> List[Dict[str, Any]]:
+        """Internships requiring any of ``skills``, most shared skills first.
+
+        Rows are ``{'id', 'title', 'shared'}``; answered from internship_skills
+        without decoding the catalog.
+        """
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""SELECT i.id, i.title, COUNT(*) AS shared
+                   FROM skills k
+                   JOIN internship_skills s ON s.skill_id = k.id
+                   JOIN internships i ON i.id = s.internship_id
+                   WHERE k.name IN (SELECT value FROM json_each({p}))
+                   GROUP BY i.id
+                   ORDER BY shared DESC, i.rowid""",
+                (json.dumps(list(skills)),)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_students_with_skills(self, skills: List[str], kind: str = 'skill') -> List[Dict[str, Any]]:
+        """Students listing any of ``skills`` (or, with ``kind='interest'``, interests).
+
+        Rows are ``{'id', 'name', 'shared'}``, most shared first.
+        """
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""SELECT st.id, st.name, COUNT(*) AS shared
+                   FROM skills k
+                   JOIN student_skills s ON s.skill_id = k.id AND s.kind = {p}
+                   JOIN students st ON st.id = s.student_id
+                   WHERE k.name IN (SELECT value FROM json_each({p}))
+                   GROUP BY st.id
+                   ORDER BY shared DESC, st.rowid""",
+                (kind, json.dumps(list(skills)))
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_skill_demand(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Skills by how many internships require them, with how many students have them."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""SELECT k.name,
+                          (SELECT COUNT(*) FROM internship_skills i WHERE i.skill_id = k.id) AS internships,
+                          (SELECT COUNT(*) FROM student_skills s
+                           WHERE s.skill_id = k.id AND s.kind = 'skill') AS students
+                   FROM skills k
+                   ORDER BY internships DESC, students DESC, k.name
+                   LIMIT {p}""",
+                (limit,)
+            )
+            return [dict(row) for row in cursor.fetchall() if row['internships'] or row['students']]
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cohort totals from the trigger-maintained stats_counters table.
+
+        Keys: students, rural_students, sc_st_students, internships and
+        matches (students with a saved match list).
+        """
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT key, value FROM stats_counters")
+            return {row['key']: row['value'] for row in cursor.fetchall()}
         finally:
             conn.close()
 
+    def _bump_catalog_version(self, cursor) -> int:
+        """Advance the catalog version; returns the new one."""
+        cursor.execute("UPDATE catalog_meta SET value = value + 1 WHERE key = 'version'")
+        cursor.execute("SELECT value FROM catalog_meta WHERE key = 'version'")
+        return fetch_count(cursor)
+
+    def _skill_ids(self, cursor, names: List[str]) -> List[int]:
+        """Ids of the given skill names, adding the names not seen before."""
+        p = placeholder()
+        names = [name for name in dict.fromkeys(names or []) if isinstance(name, str) and name]
+        if not names:
+            return []
+        cursor.executemany(f"INSERT OR IGNORE INTO skills (name) VALUES ({p})", [(name,) for name in names])
+        cursor.execute(f"SELECT id FROM skills WHERE name IN (SELECT value FROM json_each({p}))", (json.dumps(names),))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _save_student_skills(self, cursor, student_id: str, skills: List[str], interests: List[str]):
+        """Replace a student's student_skills rows; called in the same transaction as the write."""
+        p = placeholder()
+        cursor.execute(f"DELETE FROM student_skills WHERE student_id = {p}", (student_id,))
+        for kind, names in (('skill', skills), ('interest', interests)):
+            cursor.executemany(
+                f"INSERT INTO student_skills (student_id, skill_id, kind) VALUES ({p}, {p}, {p})",
+                [(student_id, skill_id, kind) for skill_id in self._skill_ids(cursor, names)]
+            )
+
+    def _save_internship_skills(self, cursor, internship_id: str, skills: List[str]):
+        """Replace an internship's internship_skills rows; called in the same transaction as the write."""
+        p = placeholder()
+        cursor.execute(f"DELETE FROM internship_skills WHERE internship_id = {p}", (internship_id,))
+        cursor.executemany(
+            f"INSERT INTO internship_skills (internship_id, skill_id) VALUES ({p}, {p})",
+            [(internship_id, skill_id) for skill_id in self._skill_ids(cursor, skills)]
+        )
+
+    def get_all_matches(self) -> List[Dict[str, Any]]:
+        """Every saved match run, each with its ranked list (no reasoning)."""
+        catalog = self.get_catalog_index()
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, student_id, timestamp, profile_hash, catalog_version FROM matches")
+            runs = [dict(row) for row in cursor.fetchall()]
+            results: Dict[int, list] = {run['id']: [] for run in runs}
+            cursor.execute("SELECT run_id, internship_id, score, rank FROM match_results ORDER BY run_id, rank")
+            for row in cursor.fetchall():
+                if row['run_id'] in results:
+                    results[row['run_id']].append(row)
+            for run in runs:
+                run['matches'] = self._load_matches(results[run['id']], catalog)
+            return runs
+        finally:
+            conn.close()
+
+    def get_matches(self, student_ids: List[str]) -> List[Dict[str, Any]]:
+        """Saved match runs of the given students, as get_all_matches returns them."""
+        catalog = self.get_catalog_index()
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""SELECT id, student_id, timestamp, profile_hash, catalog_version FROM matches
+                   WHERE student_id IN (SELECT value FROM json_each({p}))""",
+                (json.dumps(list(student_ids)),)
+            )
+            runs = [dict(row) for row in cursor.fetchall()]
+            results: Dict[int, list] = {run['id']: [] for run in runs}
+            cursor.execute(
+                f"""SELECT run_id, internship_id, score, rank FROM match_results
+                   WHERE run_id IN (SELECT value FROM json_each({p})) ORDER BY run_id, rank""",
+                (json.dumps(list(results)),)
+            )
+            for row in cursor.fetchall():
+                results[row['run_id']].append(row)
+            for run in runs:
+                run['matches'] = self._load_matches(results[run['id']], catalog)
+            return runs
+        finally:
+            conn.close()
+
+    def get_match(self, student_id: str) -> Dict[str, Any] | None:
+        """Saved match run for one student, with the cache key it was computed under."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT id, student_id, timestamp, profile_hash, catalog_version FROM matches WHERE student_id = {p}",
+                (student_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            run = dict(row)
+            cursor.execute(
+                f"SELECT internship_id, score, rank FROM match_results WHERE run_id = {p} ORDER BY rank",
+                (run['id'],)
+            )
+            run['matches'] = self._load_matches(cursor.fetchall(), self.get_catalog_index())
+            return run
+        finally:
+            conn.close()
+
+    def get_students_matched_to(self, internship_id: str) -> List[str]:
+        """Students whose saved list contains an internship, deleted or not."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT DISTINCT student_id FROM match_results WHERE internship_id = {p}",
+                           (internship_id,))
+            return [row['student_id'] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def advance_match_versions(self, from_version: int, to_version: int) -> int:
+        """Re-stamp every saved run still at ``from_version``; returns how many."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"UPDATE matches SET catalog_version = {p} WHERE catalog_version = {p}",
+                           (to_version, from_version))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_student_preferences(self) -> Dict[str, List[str]]:
+        """Distinct education and location_preference values across students."""
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            preferences = {}
+            for column in ('education', 'location_preference'):
+                cursor.execute(f"SELECT DISTINCT {column} FROM students WHERE {column} IS NOT NULL")
+                preferences[column] = [row[0] for row in cursor.fetchall()]
+            return preferences
+        finally:
+            conn.close()
+
+    def get_rematch_candidates(self, internship_id: str, top_k: int, ceilings: Dict[str, Any]) -> List[str]:
+        """Students whose saved list an edit to one internship could change.
+
+        That is anyone whose list holds the internship or has fewer than
+        ``top_k`` rows, or whose last place scores at most the student's
+        ceiling for the internship (``MatchingEngine.score_ceilings``). Every
+        other saved list stays as it is.
+        """
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""WITH shared AS (
+                       SELECT s.student_id, COUNT(*) AS n FROM internship_skills i
+                       JOIN student_skills s ON s.skill_id = i.skill_id AND s.kind = 'skill'
+                       WHERE i.internship_id = {p}
+                       GROUP BY s.student_id
+                   )
+                   SELECT m.student_id FROM matches m
+                   LEFT JOIN match_results last ON last.run_id = m.id AND last.rank = {p}
+                   LEFT JOIN students st ON st.id = m.student_id
+                   LEFT JOIN shared ON shared.student_id = m.student_id
+                   LEFT JOIN json_each({p}) edu ON edu.key = st.education
+                   LEFT JOIN json_each({p}) loc ON loc.key = st.location_preference
+                   WHERE last.run_id IS NULL OR last.score <= (
+                       {p} + {p} * COALESCE(shared.n, 0)
+                       + {p} * COALESCE(MIN(st.cgpa / 10.0, 1.0), 1.0)
+                       + CASE WHEN st.past_participation THEN {p} ELSE {p} END
+                       + COALESCE(edu.value, {p}) + COALESCE(loc.value, {p}))
+                   UNION
+                   SELECT student_id FROM match_results WHERE internship_id = {p}""",
+                (internship_id, top_k,
+                 json.dumps(ceilings['education']), json.dumps(ceilings['location']),
+                 ceilings['base'], ceilings['per_shared_skill'], ceilings['cgpa'],
+                 ceilings['participation'][1], ceilings['participation'][0],
+                 ceilings['other_education'], ceilings['other_location'], internship_id)
+            )
+            return [row['student_id'] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _load_matches(rows, catalog: CatalogIndex) -> List[MatchRecord]:
+        """Ranked results as records sharing the catalog's internships.
+
+        Reasoning is not stored; callers that show it derive it with
+        ``MatchingEngine.attach_reasoning``. Internships deleted since the
+        run are skipped.
+        """
+        matches = []
+        for row in rows:
+            j = catalog.positions.get(row['internship_id'])
+            if j is not None:
+                matches.append(MatchRecord(catalog.internships[j], row['score'], row['rank']))
+        return matches
+
     def add_match(self, match_data: Dict[str, Any]):
+        self.add_matches_bulk([match_data])
+
+    def add_matches_bulk(self, match_rows: List[Dict[str, Any]], chunk_size: int = MATCH_WRITE_CHUNK):
+        """Save the match lists of many students in a single transaction.
+
+        Each student has one ``matches`` row (the run), UPSERTed on
+        ``student_id``, and one ``match_results`` row per ranked internship.
+        Rows go through ``executemany`` ``chunk_size`` students at a time,
+        which bounds the parameter lists held in memory, and everything is
+        committed once at the end. A student listed twice keeps the last list.
+        """
+        latest = {row.get('student_id'): row for row in match_rows}
+        if not latest:
+            return
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            rows = list(latest.values())
+            for start in range(0, len(rows), max(1, chunk_size)):
+                chunk = rows[start:start + max(1, chunk_size)]
+                # One JSON array parameter instead of an IN-list per id
+                student_ids = json.dumps([row.get('student_id') for row in chunk])
+                cursor.execute(
+                    f"""DELETE FROM match_results WHERE run_id IN (
+                           SELECT id FROM matches WHERE student_id IN (SELECT value FROM json_each({p})))""",
+                    (student_ids,)
+                )
+                cursor.executemany(
+                    f"""INSERT INTO matches (student_id, timestamp, profile_hash, catalog_version)
+                       VALUES ({p}, {p}, {p}, {p})
+                       ON CONFLICT(student_id) DO UPDATE SET
+                           timestamp = excluded.timestamp,
+                           profile_hash = excluded.profile_hash,
+                           catalog_version = excluded.catalog_version,
+                           matches = NULL""",
+                    [
+                        (row.get('student_id'), row.get('timestamp'), row.get('profile_hash', ''),
+                         row.get('catalog_version'))
+                        for row in chunk
+                    ]
+                )
+                cursor.execute(
+                    f"SELECT student_id, id FROM matches WHERE student_id IN (SELECT value FROM json_each({p}))",
+                    (student_ids,)
+                )
+                run_ids = dict(cursor.fetchall())
+                cursor.executemany(
+                    f"""INSERT INTO match_results (run_id, student_id, internship_id, score, rank)
+                       VALUES ({p}, {p}, {p}, {p}, {p})""",
+                    [
+                        (run_ids[row.get('student_id')], row.get('student_id'), m['internship'].get('id'),
+                         m['score'], m['rank'])
+                        for row in chunk
+                        for m in row.get('matches', [])
+                    ]
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create_job(self, job_id: str, kind: str, stale_after: int = 600) -> str:
+        """Queue a job unless one of this kind is already active; returns the active job's id.
+
+        The partial unique index on ``jobs(kind)`` makes the check and the
+        insert one atomic statement, so workers submitting together start a
+        single job. An active job that has not reported for ``stale_after``
+        seconds is marked failed first, so a crashed worker does not block
+        its kind forever.
+        """
+        now = datetime.now()
+        cutoff = (now - timedelta(seconds=stale_after)).isoformat()
+        now = now.isoformat()
         conn = get_connection()
         p = placeholder()
         try:
             cursor = conn.cursor()
             cursor.execute(
-                f"DELETE FROM matches WHERE student_id = {p}",
-                (match_data.get('student_id'),)
+                f"""UPDATE jobs SET status = 'failed', error = 'No progress reported', finished_at = {p}
+                   WHERE kind = {p} AND status IN ('queued', 'running') AND updated_at < {p}""",
+                (now, kind, cutoff)
             )
             cursor.execute(
-                f"""INSERT INTO matches (student_id, matches, timestamp)
-                   VALUES ({p}, {p}, {p})""",
+                f"""INSERT INTO jobs (id, kind, status, created_at, updated_at)
+                   VALUES ({p}, {p}, 'queued', {p}, {p})
+                   ON CONFLICT DO NOTHING""",
+                (job_id, kind, now, now)
+            )
+            if not cursor.rowcount:
+                cursor.execute(
+                    f"SELECT id FROM jobs WHERE kind = {p} AND status IN ('queued', 'running')", (kind,)
+                )
+                job_id = cursor.fetchone()['id']
+            conn.commit()
+            return job_id
+        finally:
+            conn.close()
+
+    def get_job(self, job_id: str) -> Dict[str, Any] | None:
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM jobs WHERE id = {p}", (job_id,))
+            row = cursor.fetchone()
+            return self._job_from_row(row) if row else None
+        finally:
+            conn.close()
+
+    def get_active_job(self, kind: str, stale_after: int = 600) -> Dict[str, Any] | None:
+        """Latest queued or running job of this kind that has reported recently."""
+        cutoff = (datetime.now() - timedelta(seconds=stale_after)).isoformat()
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""SELECT * FROM jobs
+                   WHERE kind = {p} AND status IN ('queued', 'running') AND updated_at >= {p}
+                   ORDER BY created_at DESC LIMIT 1""",
+                (kind, cutoff)
+            )
+            row = cursor.fetchone()
+            return self._job_from_row(row) if row else None
+        finally:
+            conn.close()
+
+    def get_latest_job(self, kind: str) -> Dict[str, Any] | None:
+        """Most recently created job of this kind, whatever its status."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM jobs WHERE kind = {p} ORDER BY created_at DESC LIMIT 1", (kind,))
+            row = cursor.fetchone()
+            return self._job_from_row(row) if row else None
+        finally:
+            conn.close()
+
+    def update_job_progress(self, job_id: str, done: int, total: int) -> bool:
+        """Record progress; returns True if cancellation has been requested.
+
+        A job no longer active (marked failed as stale by ``create_job``) is
+        told to stop as well.
+        """
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""UPDATE jobs SET status = 'running', progress_done = {p}, progress_total = {p},
+                       updated_at = {p}
+                   WHERE id = {p} AND status IN ('queued', 'running')""",
+                (done, total, datetime.now().isoformat(), job_id)
+            )
+            if not cursor.rowcount:
+                conn.commit()
+                return True
+            cursor.execute(f"SELECT cancel_requested FROM jobs WHERE id = {p}", (job_id,))
+            cancel_requested = bool(fetch_count(cursor))
+            conn.commit()
+            return cancel_requested
+        finally:
+            conn.close()
+
+    def finish_job(self, job_id: str, status: str, result: Dict[str, Any] | None = None,
+                   error: str | None = None):
+        now = datetime.now().isoformat()
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""UPDATE jobs SET status = {p}, result = {p}, error = {p}, updated_at = {p}, finished_at = {p}
+                   WHERE id = {p}""",
+                (status, json.dumps(result) if result is not None else None, error, now, now, job_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def request_job_cancel(self, job_id: str) -> bool:
+        """Flag a queued or running job for cancellation; False if it already finished."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""UPDATE jobs SET cancel_requested = 1
+                   WHERE id = {p} AND status IN ('queued', 'running')""",
+                (job_id,)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def _job_from_row(self, row) -> Dict[str, Any]:
+        d = dict(row)
+        d['result'] = json.loads(d['result']) if d['result'] else None
+        d['cancel_requested'] = bool(d['cancel_requested'])
+        return d
+
+    def save_allocation(self, catalog_version: int, job_id: str, report: Dict[str, Any]):
+        """Store an allocation report as the one for ``catalog_version``, replacing any earlier one."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""INSERT INTO allocations (catalog_version, job_id, created_at, result)
+                   VALUES ({p}, {p}, {p}, {p})
+                   ON CONFLICT(catalog_version) DO UPDATE SET
+                       job_id = excluded.job_id, created_at = excluded.created_at, result = excluded.result""",
+                (catalog_version, job_id, datetime.now().isoformat(), json.dumps(report))
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_allocation(self, catalog_version: int) -> Dict[str, Any] | None:
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM allocations WHERE catalog_version = {p}", (catalog_version,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return {'catalog_version': row['catalog_version'], 'job_id': row['job_id'],
+                    'created_at': row['created_at'], **json.loads(row['result'])}
+        finally:
+            conn.close()
+
+    def add_shadow_result(self, result: Dict[str, Any]):
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""INSERT INTO shadow_results
+                   (source, student_id, catalog_version, top_k, overlap, max_score_delta,
+                    mean_score_delta, max_rank_diff, passed, details, created_at)
+                   VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p})""",
                 (
-                    match_data.get('student_id'),
-                    json.dumps(match_data.get('matches', [])),
-                    match_data.get('timestamp'),
+                    result.get('source'), result.get('student_id'), result.get('catalog_version'),
+                    result.get('top_k'), result.get('overlap'), result.get('max_score_delta'),
+                    result.get('mean_score_delta'), result.get('max_rank_diff'),
+                    1 if result.get('passed') else 0,
+                    json.dumps({'missing': result.get('missing', []), 'extra': result.get('extra', [])}),
+                    result.get('created_at'),
                 )
             )
             conn.commit()
         finally:
             conn.close()
 
+    def get_shadow_summary(self, source: str | None = None) -> Dict[str, Any]:
+        """Aggregate of recorded shadow comparisons, optionally for one source."""
+        conn = get_connection()
+        p = placeholder()
+        try:
+            cursor = conn.cursor()
+            where = f"WHERE source = {p}" if source else ""
+            cursor.execute(
+                f"""SELECT COUNT(*) AS comparisons,
+                          COALESCE(SUM(1 - passed), 0) AS failed,
+                          MIN(overlap) AS min_overlap,
+                          MAX(max_score_delta) AS max_score_delta,
+                          AVG(mean_score_delta) AS mean_score_delta,
+                          MAX(max_rank_diff) AS max_rank_diff,
+                          MAX(created_at) AS last_seen
+                   FROM shadow_results {where}""",
+                (source,) if source else ()
+            )
+            return dict(cursor.fetchone())
+        finally:
+            conn.close()
+
     def get_all_admins(self) -> List[Dict[str, Any]]:
         conn = get_connection()
         try:
@@ -301,7 +1069,8 @@ class DataManager:
         finally:
             conn.close()
 
-    def add_internship(self, internship_data: Dict[str, Any]):
+    def add_internship(self, internship_data: Dict[str, Any]) -> int:
+        """Returns the catalog version the change produced."""
         conn = get_connection()
         p = placeholder()
         try:
@@ -325,11 +1094,15 @@ class DataManager:
                     internship_data.get('apply_url', ''),
                 )
             )
+            self._save_internship_skills(cursor, internship_data['id'], internship_data.get('required_skills', []))
+            version = self._bump_catalog_version(cursor)
             conn.commit()
+            return version
         finally:
             conn.close()
 
-    def update_internship(self, internship_id: str, internship_data: Dict[str, Any]):
+    def update_internship(self, internship_id: str, internship_data: Dict[str, Any]) -> int:
+        """Returns the catalog version the change produced."""
         conn = get_connection()
         p = placeholder()
         try:
@@ -353,7 +1126,10 @@ class DataManager:
                     internship_id,
                 )
             )
+            self._save_internship_skills(cursor, internship_id, internship_data.get('required_skills', []))
+            version = self._bump_catalog_version(cursor)
             conn.commit()
+            return version
         finally:
             conn.close()
 
@@ -405,13 +1181,16 @@ class DataManager:
         finally:
             conn.close()
 
-    def delete_internship(self, internship_id: str):
+    def delete_internship(self, internship_id: str) -> int:
+        """Returns the catalog version the change produced."""
         conn = get_connection()
         p = placeholder()
         try:
             cursor = conn.cursor()
             cursor.execute(f"DELETE FROM internships WHERE id = {p}", (internship_id,))
+            version = self._bump_catalog_version(cursor)
             conn.commit()
+            return version
         finally:
             conn.close()
 
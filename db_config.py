@@ -1,23 +1,141 @@
+import json
 import os
 import sqlite3
 import logging
+import threading
+import time
+import weakref
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.environ.get('SQLITE_DB_PATH', os.path.join(os.path.dirname(__file__), 'data', 'internship.db'))
 
+# Applied once when a connection is opened, not on every checkout
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))}",
+    "PRAGMA cache_size=-16000",      # negative means KiB: a 16 MiB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MiB
+    "PRAGMA foreign_keys=ON",
+)
+
+# Prepared statements kept per connection; they survive between requests now
+# that connections do
+STATEMENT_CACHE_SIZE = 256
+
 
 def placeholder():
     return '?'
 
 
+class PooledConnection(sqlite3.Connection):
+    """A connection owned by one thread; ``close()`` hands it back to the pool."""
+
+    def close(self):
+        _pool.release(self)
+
+    def discard(self):
+        sqlite3.Connection.close(self)
+
+
+class ConnectionPool:
+    """One long-lived connection per thread, per process.
+
+    ``acquire`` returns the calling thread's connection, opening and
+    configuring it on first use; calls nest, and when the outermost caller
+    releases it any transaction left open is rolled back, as closing a
+    connection used to do. A connection dies with its thread. After a fork
+    (gunicorn workers) inherited connections are never used or closed in the
+    child, which opens its own.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = weakref.WeakSet()
+        # Inherited from the parent process; kept referenced so they are
+        # never finalized (and closed) in this one
+        self._inherited = []
+        self._counters = {'opened': 0, 'checkouts': 0, 'reused': 0, 'rollbacks': 0, 'forks': 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    def _after_fork(self):
+        with self._lock:
+            self._inherited.append((self._local, list(self._connections)))
+            self._local = threading.local()
+            self._connections = weakref.WeakSet()
+            self._pid = os.getpid()
+            # Counters describe this worker, not the parent
+            forks = self._counters['forks'] + 1
+            self._counters = dict.fromkeys(self._counters, 0)
+            self._counters['forks'] = forks
+
+    def _connect(self) -> PooledConnection:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.path, factory=PooledConnection, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._connections.add(conn)
+            self._counters['opened'] += 1
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        if os.getpid() != self._pid:
+            self._after_fork()
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = self._connect()
+            local.depth = 0
+        else:
+            self._count('reused')
+        local.depth += 1
+        self._count('checkouts')
+        return conn
+
+    def release(self, conn: PooledConnection):
+        local = self._local
+        if getattr(local, 'conn', None) is not conn:
+            # Not this thread's pooled connection (e.g. opened before a fork)
+            return
+        local.depth = max(local.depth - 1, 0)
+        if local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+            self._count('rollbacks')
+
+    def close_thread_connection(self):
+        """Really close the calling thread's connection, e.g. before a worker thread exits."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            conn.discard()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pid': self._pid,
+                'open_connections': len(self._connections),
+                **self._counters,
+            }
+
+
+_pool = ConnectionPool(DB_PATH)
+
+
 def get_connection():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    return _pool.acquire()
+
+
+def pool_stats():
+    return _pool.stats()
 
 
 def fetch_count(cursor):
@@ -82,10 +200,116 @@ def init_db():
             student_id TEXT,
             matches TEXT,
             timestamp TEXT,
+            profile_hash TEXT DEFAULT '',
+            catalog_version INTEGER,
             FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
         )
     """)
 
+    # One row per ranked internship of a saved run; matches.matches (the old
+    # JSON list) is left empty for runs written this way
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS match_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL,
+            student_id TEXT NOT NULL,
+            internship_id TEXT NOT NULL,
+            score REAL NOT NULL,
+            rank INTEGER NOT NULL,
+            FOREIGN KEY (run_id) REFERENCES matches(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Skills, interests and required skills as rows, so "who knows SQL" is an
+    # indexed join; the JSON columns stay the source the engine loads. Names
+    # are stored as given because matching compares them exactly.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS student_skills (
+            student_id TEXT NOT NULL,
+            skill_id INTEGER NOT NULL,
+            kind TEXT NOT NULL DEFAULT 'skill',
+            PRIMARY KEY (student_id, kind, skill_id),
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (skill_id) REFERENCES skills(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS internship_skills (
+            internship_id TEXT NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY (internship_id, skill_id),
+            FOREIGN KEY (internship_id) REFERENCES internships(id) ON DELETE CASCADE,
+            FOREIGN KEY (skill_id) REFERENCES skills(id)
+        )
+    """)
+
+    # Row counts kept current by triggers (migration 4), so dashboards read
+    # totals without scanning the tables
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('version', 0)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            progress_done INTEGER DEFAULT 0,
+            progress_total INTEGER DEFAULT 0,
+            cancel_requested INTEGER DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            finished_at TEXT
+        )
+    """)
+
+    # Latest capacity-aware allocation per catalog version; the report
+    # (assignments included) is stored as JSON and served until the catalog changes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS allocations (
+            catalog_version INTEGER PRIMARY KEY,
+            job_id TEXT,
+            created_at TEXT,
+            result TEXT NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS shadow_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT,
+            student_id TEXT,
+            catalog_version INTEGER,
+            top_k INTEGER,
+            overlap REAL,
+            max_score_delta REAL,
+            mean_score_delta REAL,
+            max_rank_diff INTEGER,
+            passed INTEGER,
+            details TEXT,
+            created_at TEXT
+        )
+    """)
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS admins (
             id TEXT PRIMARY KEY,
@@ -100,23 +324,332 @@ def init_db():
     cursor.close()
     conn.close()
 
-    _migrate()
+    return _migrate()
+
+
+def _add_missing_columns(cursor):
+    """Columns added after the first release; a fresh database already has them."""
+    cursor.execute("PRAGMA table_info(students)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if 'email_verified' not in columns:
+        cursor.execute("ALTER TABLE students ADD COLUMN email_verified INTEGER DEFAULT 0")
+    if 'verification_token' not in columns:
+        cursor.execute("ALTER TABLE students ADD COLUMN verification_token TEXT DEFAULT ''")
+    cursor.execute("PRAGMA table_info(matches)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if 'profile_hash' not in columns:
+        cursor.execute("ALTER TABLE matches ADD COLUMN profile_hash TEXT DEFAULT ''")
+    if 'catalog_version' not in columns:
+        cursor.execute("ALTER TABLE matches ADD COLUMN catalog_version INTEGER")
+
+
+def _add_lookup_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_email ON students(email)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_verification_token ON students(verification_token)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_student_id ON matches(student_id)")
+
+
+def _normalize_match_lists(cursor):
+    """Index match_results and move every JSON match list into it."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_results_run ON match_results(run_id, rank)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_results_internship ON match_results(internship_id)")
+    cursor.execute("SELECT id, student_id, matches FROM matches WHERE matches IS NOT NULL AND matches != ''")
+    for run_id, student_id, blob in cursor.fetchall():
+        try:
+            saved = json.loads(blob)
+        except ValueError:
+            saved = []
+        cursor.executemany(
+            "INSERT INTO match_results (run_id, student_id, internship_id, score, rank) VALUES (?, ?, ?, ?, ?)",
+            [
+                (run_id, student_id, m['internship'].get('id'), m.get('score', 0), m.get('rank', rank))
+                for rank, m in enumerate(saved, start=1)
+                if isinstance(m, dict) and isinstance(m.get('internship'), dict) and m['internship'].get('id')
+            ]
+        )
+    cursor.execute("UPDATE matches SET matches = NULL")
+
+
+def _add_stats_counters(cursor):
+    """Backfill stats_counters and add the triggers that keep it current."""
+    cursor.execute("""
+        INSERT OR REPLACE INTO stats_counters (key, value)
+        SELECT 'students', COUNT(*) FROM students
+        UNION ALL SELECT 'rural_students', COUNT(*) FROM students WHERE location_type = 'rural'
+        UNION ALL SELECT 'sc_st_students', COUNT(*) FROM students WHERE category IN ('SC', 'ST')
+        UNION ALL SELECT 'internships', COUNT(*) FROM internships
+        UNION ALL SELECT 'matches', COUNT(*) FROM matches
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_students_stats_insert AFTER INSERT ON students BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE key = 'students';
+            UPDATE stats_counters SET value = value + 1 WHERE key = 'rural_students' AND NEW.location_type = 'rural';
+            UPDATE stats_counters SET value = value + 1 WHERE key = 'sc_st_students' AND NEW.category IN ('SC', 'ST');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_students_stats_delete AFTER DELETE ON students BEGIN
+            UPDATE stats_counters SET value = value - 1 WHERE key = 'students';
+            UPDATE stats_counters SET value = value - 1 WHERE key = 'rural_students' AND OLD.location_type = 'rural';
+            UPDATE stats_counters SET value = value - 1 WHERE key = 'sc_st_students' AND OLD.category IN ('SC', 'ST');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_students_stats_update AFTER UPDATE OF location_type, category ON students
+        BEGIN
+            UPDATE stats_counters
+            SET value = value + (NEW.location_type IS 'rural') - (OLD.location_type IS 'rural')
+            WHERE key = 'rural_students';
+            UPDATE stats_counters
+            SET value = value + (COALESCE(NEW.category IN ('SC', 'ST'), 0)) - (COALESCE(OLD.category IN ('SC', 'ST'), 0))
+            WHERE key = 'sc_st_students';
+        END
+    """)
+    for table in ('internships', 'matches'):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_insert AFTER INSERT ON {table} BEGIN
+                UPDATE stats_counters SET value = value + 1 WHERE key = '{table}';
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_delete AFTER DELETE ON {table} BEGIN
+                UPDATE stats_counters SET value = value - 1 WHERE key = '{table}';
+            END
+        """)
+
+
+def _unique_match_runs(cursor):
+    """One run per student, so saving a list can UPSERT on student_id."""
+    stale = "SELECT id FROM matches WHERE id NOT IN (SELECT MAX(id) FROM matches GROUP BY student_id)"
+    cursor.execute(f"DELETE FROM match_results WHERE run_id IN ({stale})")
+    cursor.execute(f"DELETE FROM matches WHERE id IN ({stale})")
+    cursor.execute("DROP INDEX IF EXISTS idx_matches_student_id")
+    cursor.execute("CREATE UNIQUE INDEX idx_matches_student_id ON matches(student_id)")
+
+
+def _normalize_skills(cursor):
+    """Index the skill join tables and fill them from the JSON columns."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_student_skills_skill ON student_skills(skill_id, kind)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_internship_skills_skill ON internship_skills(skill_id)")
+    targets = [
+        ("students", "skills", "student_skills (student_id, skill_id, kind)", ", 'skill'"),
+        ("students", "interests", "student_skills (student_id, skill_id, kind)", ", 'interest'"),
+        ("internships", "required_skills", "internship_skills (internship_id, skill_id)", ""),
+    ]
+    for table, column, target, kind in targets:
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO skills (name)
+            SELECT DISTINCT j.value FROM {table} t, json_each(t.{column}) j
+            WHERE json_valid(t.{column}) AND j.type = 'text' AND j.value != ''
+        """)
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {target}
+            SELECT DISTINCT t.id, k.id{kind}
+            FROM {table} t, json_each(t.{column}) j
+            JOIN skills k ON k.name = j.value
+            WHERE json_valid(t.{column})
+        """)
+
+
+def _single_active_job(cursor):
+    """At most one queued or running job per kind, enforced by a partial unique index."""
+    cursor.execute("""
+        UPDATE jobs SET status = 'failed', error = 'Superseded by a newer job'
+        WHERE status IN ('queued', 'running') AND rowid NOT IN (
+            SELECT MAX(rowid) FROM jobs WHERE status IN ('queued', 'running') GROUP BY kind)
+    """)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_kind ON jobs(kind)
+        WHERE status IN ('queued', 'running')
+    """)
+
+
+def _profiles_version(cursor):
+    """A counter in catalog_meta bumped by every change to a scored student field."""
+    cursor.execute("INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('profiles_version', 0)")
+    for name, event in (('insert', 'INSERT'), ('delete', 'DELETE'),
+                        ('update', 'UPDATE OF skills, interests, education, cgpa, location_preference, '
+                                   'location_type, category, past_participation')):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_students_profiles_{name} AFTER {event} ON students BEGIN
+                UPDATE catalog_meta SET value = value + 1 WHERE key = 'profiles_version';
+            END
+        """)
+
+
+def _search_indexes(cursor):
+    """Case-insensitive indexes for the admin lists' prefix search (the LIKE optimization needs NOCASE)."""
+    for table, columns in (('students', ('name', 'email')), ('internships', ('title', 'organization', 'sector'))):
+        for column in columns:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_nocase "
+                           f"ON {table}({column} COLLATE NOCASE)")
+
+
+def _identities_version(cursor):
+    """A counter in catalog_meta bumped by every update or deletion of a student or admin row."""
+    cursor.execute("INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('identities_version', 0)")
+    for table in ('students', 'admins'):
+        for name, event in (('update', 'UPDATE'), ('delete', 'DELETE')):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_identities_{name} AFTER {event} ON {table} BEGIN
+                    UPDATE catalog_meta SET value = value + 1 WHERE key = 'identities_version';
+                END
+            """)
+
+
+def _activity_indexes(cursor):
+    """Timestamp indexes the admin activity log pages through; missing timestamps become ''."""
+    cursor.execute("UPDATE students SET created_at = '' WHERE created_at IS NULL")
+    cursor.execute("UPDATE matches SET timestamp = '' WHERE timestamp IS NULL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_created_at ON students(created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_timestamp ON matches(timestamp)")
+
+
+def _identity_revisions(cursor):
+    """A per-row revision on students and admins, bumped by every update.
+
+    Replaces migration 10's single counter, which dropped every cached
+    identity whenever any one of them changed.
+    """
+    for table in ('students', 'admins'):
+        cursor.execute(f"PRAGMA table_info({table})")
+        if 'revision' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_revision AFTER UPDATE ON {table}
+            WHEN NEW.revision = OLD.revision BEGIN
+                UPDATE {table} SET revision = OLD.revision + 1 WHERE rowid = NEW.rowid;
+            END
+        """)
+        for name in ('update', 'delete'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_identities_{name}")
+    cursor.execute("DELETE FROM catalog_meta WHERE key = 'identities_version'")
+
+# (version, description, step); the database's PRAGMA user_version is the
+# last version applied. Append only; never renumber or edit a released step.
+MIGRATIONS = [
+    (1, 'verification and match cache columns', _add_missing_columns),
+    (2, 'indexes on students.email, students.verification_token, matches.student_id', _add_lookup_indexes),
+    (3, 'match_results rows instead of JSON match lists', _normalize_match_lists),
+    (4, 'trigger-maintained stats_counters', _add_stats_counters),
+    (5, 'unique matches.student_id', _unique_match_runs),
+    (6, 'skills, student_skills and internship_skills', _normalize_skills),
+    (7, 'one active job per kind', _single_active_job),
+    (8, 'trigger-maintained profiles_version', _profiles_version),
+    (9, 'NOCASE indexes for admin list search', _search_indexes),
+    (10, 'trigger-maintained identities_version', _identities_version),
+    (11, 'timestamp indexes for the admin activity log', _activity_indexes),
+    (12, 'per-row revision on students and admins', _identity_revisions),
+]
+
+# Hot queries and the index each must use, checked with EXPLAIN QUERY PLAN
+QUERY_PLAN_CHECKS = [
+    ("SELECT * FROM students WHERE email = ?", ('',), 'idx_students_email'),
+    ("SELECT id FROM students WHERE verification_token = ? AND verification_token != ''", ('',),
+     'idx_students_verification_token'),
+    ("SELECT * FROM matches WHERE student_id = ?", ('',), 'idx_matches_student_id'),
+    ("DELETE FROM matches WHERE student_id = ?", ('',), 'idx_matches_student_id'),
+    ("SELECT s.id FROM students s JOIN matches m ON m.student_id = s.id", (), 'idx_matches_student_id'),
+    ("SELECT internship_id, score, rank FROM match_results WHERE run_id = ? ORDER BY rank", (0,),
+     'idx_match_results_run'),
+    ("SELECT internship_id, score FROM match_results WHERE run_id = ? AND rank = 1", (0,),
+     'idx_match_results_run'),
+    ("SELECT DISTINCT student_id FROM match_results WHERE internship_id = ?", ('',),
+     'idx_match_results_internship'),
+    ("SELECT internship_id FROM internship_skills WHERE skill_id = ?", (0,), 'idx_internship_skills_skill'),
+    ("SELECT student_id FROM student_skills WHERE skill_id = ? AND kind = 'skill'", (0,),
+     'idx_student_skills_skill'),
+    ("SELECT rowid FROM students WHERE name LIKE ? ESCAPE '\\'", ('a%',), 'idx_students_name_nocase'),
+    ("SELECT rowid FROM students WHERE email LIKE ? ESCAPE '\\'", ('a%',), 'idx_students_email_nocase'),
+    ("SELECT rowid FROM internships WHERE title LIKE ? ESCAPE '\\'", ('a%',), 'idx_internships_title_nocase'),
+    ("SELECT rowid FROM internships WHERE organization LIKE ? ESCAPE '\\'", ('a%',),
+     'idx_internships_organization_nocase'),
+    ("SELECT rowid FROM internships WHERE sector LIKE ? ESCAPE '\\'", ('a%',), 'idx_internships_sector_nocase'),
+    ("SELECT rowid FROM students WHERE (created_at, rowid) < (?, ?) ORDER BY created_at DESC, rowid DESC LIMIT 50",
+     ('', 0), 'idx_students_created_at'),
+    ("SELECT id FROM matches WHERE (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT 50",
+     ('', 0), 'idx_matches_timestamp'),
+]
+
+
+def schema_version(cursor) -> int:
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
 
 
 def _migrate():
-    """Add columns to existing tables if they don't exist."""
+    """Apply pending MIGRATIONS in order, one transaction each.
+
+    ``BEGIN IMMEDIATE`` takes the write lock before re-reading the version,
+    so workers starting together apply each step once. Returns a timing
+    report of the steps this call applied.
+    """
     conn = get_connection()
     cursor = conn.cursor()
+    report = []
     try:
-        cursor.execute("PRAGMA table_info(students)")
-        columns = [row[1] for row in cursor.fetchall()]
-        if 'email_verified' not in columns:
-            cursor.execute("ALTER TABLE students ADD COLUMN email_verified INTEGER DEFAULT 0")
-        if 'verification_token' not in columns:
-            cursor.execute("ALTER TABLE students ADD COLUMN verification_token TEXT DEFAULT ''")
-        conn.commit()
-    except Exception as e:
-        logger.warning(f"Migration note: {e}")
+        for version, description, step in MIGRATIONS:
+            started = time.perf_counter()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                if schema_version(cursor) >= version:
+                    conn.rollback()
+                    continue
+                step(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.exception(f"Migration {version} ({description}) failed; schema left at version "
+                                 f"{schema_version(cursor)}")
+                break
+            seconds = round(time.perf_counter() - started, 4)
+            report.append({'version': version, 'description': description, 'seconds': seconds})
+            logger.info(f"Applied migration {version} ({description}) in {seconds}s")
+
+        for check in check_query_plans(cursor):
+            if not check['ok']:
+                logger.warning(f"Query does not use {check['index']}: {check['query']} -> {check['plan']}")
     finally:
         cursor.close()
         conn.close()
+    return report
+
+
+def check_query_plans(cursor=None):
+    """EXPLAIN QUERY PLAN of every QUERY_PLAN_CHECKS query and whether it uses its index."""
+    conn = None
+    if cursor is None:
+        conn = get_connection()
+        cursor = conn.cursor()
+    try:
+        results = []
+        for query, params, index in QUERY_PLAN_CHECKS:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+            plan = [row[-1] for row in cursor.fetchall()]
+            results.append({
+                'query': query,
+                'index': index,
+                'plan': plan,
+                'ok': any(index in step for step in plan),
+            })
+        return results
+    finally:
+        if conn is not None:
+            cursor.close()
+            conn.close()
+
+
+if __name__ == '__main__':
+    # python db_config.py: migrate the configured database and show the plans
+    logging.basicConfig(level=logging.INFO)
+    for step in init_db():
+        print(f"applied {step['version']}: {step['description']} ({step['seconds']}s)")
+    conn = get_connection()
+    print(f"{DB_PATH}: schema version {schema_version(conn.cursor())}")
+    conn.close()
+    for check in check_query_plans():
+        print(f"[{'ok' if check['ok'] else 'MISSING'}] {check['index']}: {check['query']}")
+        for step in check['plan']:
+            print(f"    {step}")
@@ -0,0 +1,63 @@
+"""
+Identity cache
+A small time-limited cache for the student and admin records that session
+validation reads on every request, so a logged-in page view does not go to
+the database for the same row over and over. Entries are per process;
+routes checks each hit against the row's trigger-maintained revision, so a
+change made by another worker is seen on the next request. Values are
+shared between threads and must be immutable.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire ``ttl`` seconds after they are set.
+
+    Holds at most ``maxsize`` entries, evicting the least recently used.
+    ``None`` is never stored, so ``get`` returning ``None`` always means a miss.
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if value is None or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._entries), 'ttl': self.ttl, 'hits': self.hits, 'misses': self.misses}
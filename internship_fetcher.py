@@ -8,7 +8,9 @@ from bs4 import BeautifulSoup
 import re
 import time
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from urllib.parse import quote_plus, urlencode
 
 logger = logging.getLogger(__name__)
@@ -33,34 +35,80 @@ class InternshipFetcher:
     """Fetches live internships from multiple platforms."""
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
-
-    def fetch_all(self, query: str = '', location: str = '', skills: List[str] = None,
-                  max_per_platform: int = 10) -> List[Dict[str, Any]]:
-        """Fetch internships from all platforms and return unified results."""
-        search_query = query or self._build_query_from_skills(skills or [])
-
-        all_results = []
-        fetchers = [
+        # requests.Session is not safe to share between threads, and every
+        # platform is scraped on its own worker thread
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(HEADERS)
+        return session
+
+    def _platforms(self):
+        return [
             ('indeed', self._fetch_indeed),
             ('linkedin', self._fetch_linkedin),
             ('naukri', self._fetch_naukri),
             ('internshala', self._fetch_internshala),
         ]
 
-        for platform, fetcher in fetchers:
-            try:
-                results = fetcher(search_query, location, max_per_platform)
-                for r in results:
-                    r['platform'] = platform
-                    r['platform_logo'] = PLATFORM_LOGOS.get(platform, '')
-                all_results.extend(results)
-                logger.info(f"Fetched {len(results)} internships from {platform}")
-            except Exception as e:
-                logger.warning(f"Failed to fetch from {platform}: {e}")
-
-        return all_results
+    def fetch_all(self, query: str = '', location: str = '', skills: List[str] = None,
+                  max_per_platform: int = 10, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Fetch internships from all platforms and return unified results."""
+        by_platform = dict(self.fetch_iter(query, location, skills, max_per_platform, timeout))
+        # Platform order rather than arrival order, so results are stable
+        return [r for platform, _ in self._platforms() for r in by_platform.get(platform, [])]
+
+    def fetch_iter(self, query: str = '', location: str = '', skills: List[str] = None,
+                   max_per_platform: int = 10, timeout: Optional[float] = None
+                   ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Scrape every platform concurrently, yielding ``(platform, results)`` as each finishes.
+
+        The requests are already in flight when this returns, so the caller
+        can do other work before iterating. Platforms still running
+        ``timeout`` seconds after this call are skipped, however long the
+        caller took to start iterating; their threads finish in the
+        background and the results are dropped.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        search_query = query or self._build_query_from_skills(skills or [])
+        platforms = self._platforms()
+        executor = ThreadPoolExecutor(max_workers=len(platforms), thread_name_prefix='fetch')
+        futures = {
+            executor.submit(self._fetch_platform, platform, fetcher, search_query, location, max_per_platform): platform
+            for platform, fetcher in platforms
+        }
+        executor.shutdown(wait=False)
+        return self._completed(futures, timeout, deadline)
+
+    @staticmethod
+    def _completed(futures, timeout: Optional[float],
+                   deadline: Optional[float]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        pending = set(futures.values())
+        # Runs on the first next(), so the time already spent counts
+        remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+        try:
+            for future in as_completed(futures, timeout=remaining):
+                pending.discard(futures[future])
+                yield futures[future], future.result()
+        except FuturesTimeout:
+            logger.warning(f"Gave up on {', '.join(sorted(pending))} after {timeout}s")
+
+    def _fetch_platform(self, platform: str, fetcher, query: str, location: str,
+                        max_results: int) -> List[Dict[str, Any]]:
+        try:
+            results = fetcher(query, location, max_results)
+            for r in results:
+                r['platform'] = platform
+                r['platform_logo'] = PLATFORM_LOGOS.get(platform, '')
+            logger.info(f"Fetched {len(results)} internships from {platform}")
+            return results
+        except Exception as e:
+            logger.warning(f"Failed to fetch from {platform}: {e}")
+            return []
 
     def _build_query_from_skills(self, skills: List[str]) -> str:
         """Convert student skills into a search query."""
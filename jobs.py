@@ -0,0 +1,107 @@
+"""
+Background jobs
+Runs long admin tasks off the request thread. Job state lives in the SQLite
+``jobs`` table, so any gunicorn worker can report progress or accept a
+cancellation for a job started by another.
+"""
+
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from allocation import AllocationSolver
+from batch_runner import BatchRunner
+from matching_engine import MatchingEngine
+from rematch import IncrementalRematcher
+
+logger = logging.getLogger(__name__)
+
+MATCH_ALL = 'match_all'
+ALLOCATE = 'allocate'
+REMATCH = 'rematch'
+COMPONENTS = 'component_store'
+
+# Processes a match-all job scores shards in; 1 scores in the job thread,
+# more start a forkserver pool (see batch_runner)
+MATCH_ALL_WORKERS = int(os.environ.get('MATCH_ALL_WORKERS', '1'))
+
+
+class JobManager:
+    """Queues jobs on a small thread pool and records their lifecycle."""
+
+    def __init__(self, data_manager, engine: MatchingEngine, max_workers: int = 1,
+                 shard_size: int = 500, batch_workers: int = MATCH_ALL_WORKERS):
+        self.data_manager = data_manager
+        self.engine = engine
+        self.shard_size = shard_size
+        self.batch_workers = batch_workers
+        self.rematcher = IncrementalRematcher(data_manager, engine)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+    def submit_match_all(self) -> str:
+        """Start batch matching unless one is already running; returns the job id."""
+        return self._submit(MATCH_ALL, self._run_match_all)
+
+    def submit_allocation(self, time_budget: float) -> str:
+        """Solve the capacity-aware allocation for the current catalog; returns the job id."""
+        return self._submit(ALLOCATE, lambda job_id: self._run_allocation(job_id, time_budget))
+
+    def submit_rematch(self, internship_id: str, version: int, deleted: bool = False) -> str:
+        """Bring saved match lists up to date with the catalog edit that produced ``version``."""
+        # One job per edit: a second edit must not be folded into a running one
+        return self._submit(f"{REMATCH}:{version}",
+                            lambda job_id: self._run_rematch(internship_id, version, deleted))
+
+    def submit_component_build(self, store) -> str:
+        """Rebuild a ComponentStore for the current catalog and profiles; returns the job id."""
+        return self._submit(COMPONENTS, lambda job_id: self._run_component_build(store))
+
+    def _submit(self, kind: str, run: Callable[[str], Tuple[str, Dict[str, Any]]]) -> str:
+        """Queue ``run(job_id)`` as a job of ``kind``, or return the id of the active one.
+
+        ``run`` returns the final status and the result to store.
+        """
+        new_id = str(uuid.uuid4())
+        job_id = self.data_manager.create_job(new_id, kind)
+        if job_id == new_id:
+            self._executor.submit(self._run, job_id, run)
+        return job_id
+
+    def _run(self, job_id: str, run: Callable[[str], Tuple[str, Dict[str, Any]]]):
+        try:
+            status, result = run(job_id)
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            self.data_manager.finish_job(job_id, 'failed', error=str(e))
+            return
+        self.data_manager.finish_job(job_id, status, result=result)
+
+    def _run_match_all(self, job_id: str) -> Tuple[str, Dict[str, Any]]:
+        runner = BatchRunner(self.data_manager, self.engine, workers=self.batch_workers,
+                             shard_size=self.shard_size)
+        summary = runner.run(
+            on_progress=lambda done, total: self.data_manager.update_job_progress(job_id, done, total)
+        )
+        return ('cancelled' if summary['cancelled'] else 'completed'), summary
+
+    def _run_allocation(self, job_id: str, time_budget: float) -> Tuple[str, Dict[str, Any]]:
+        students = self.data_manager.get_all_students()
+        catalog = self.data_manager.get_catalog_index()
+        self.data_manager.update_job_progress(job_id, 0, len(students))
+        report = AllocationSolver(self.engine, time_budget=time_budget).allocate(students, catalog)
+        self.data_manager.save_allocation(catalog.version, job_id, report)
+        summary = {key: value for key, value in report.items() if key != 'assignments'}
+        return 'completed', {'catalog_version': catalog.version, **summary}
+
+    def _run_rematch(self, internship_id: str, version: int, deleted: bool) -> Tuple[str, Dict[str, Any]]:
+        if deleted:
+            updated = self.rematcher.internship_deleted(internship_id, version)
+        else:
+            updated = self.rematcher.internship_changed(internship_id, version)
+        return 'completed', {'internship_id': internship_id, 'catalog_version': version, 'updated': updated}
+
+    def _run_component_build(self, store) -> Tuple[str, Dict[str, Any]]:
+        meta = store.rebuild()
+        return 'completed', {key: value for key, value in meta.items() if key != 'internship_ids'}
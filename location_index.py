@@ -0,0 +1,163 @@
+"""
+Location index
+Resolves free-text locations ("Bangalore", "Gurgaon, Haryana", "Pune, India")
+to canonical city and state ids from the offline gazetteer in
+``data/gazetteer.json``, so preference matching is a set lookup instead of a
+substring test and aliases such as Bengaluru/Bangalore compare equal.
+"""
+
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer.json')
+
+# Cities closer than this count as the same place (Delhi/Noida/Gurugram,
+# Mumbai/Thane/Navi Mumbai, the Chandigarh tricity)
+NEARBY_KM = 40
+
+# Longest alias in words; bounds the n-gram scan over each segment
+MAX_ALIAS_WORDS = 6
+
+# Tokens that carry no location information on their own
+IGNORED = {'india', 'bharat', 'in', 'city', 'district'}
+
+_SEPARATORS = re.compile(r'[,/;|()\n]+|\s+-\s+|\s+or\s+')
+_NON_WORD = re.compile(r'[^a-z0-9&\s-]+')
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    """A resolved location string.
+
+    ``cities`` and ``named_states`` are what the text names; ``states`` also
+    includes the states of the named cities, and ``nearby`` every city within
+    ``NEARBY_KM`` of a named one. ``unresolved`` keeps the segments the
+    gazetteer does not know so they can still be compared as text.
+    """
+
+    text: str
+    cities: FrozenSet[str]
+    named_states: FrozenSet[str]
+    states: FrozenSet[str]
+    nearby: FrozenSet[str]
+    unresolved: Tuple[str, ...]
+
+
+def normalize(text: str) -> str:
+    return ' '.join(_NON_WORD.sub(' ', (text or '').lower()).split())
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+class LocationIndex:
+    """In-memory gazetteer: alias table, city -> state, and city neighbourhoods.
+
+    ``resolve`` is memoized per string, so a catalog or a batch of postings
+    resolves each distinct location once and every later comparison is a
+    frozenset intersection.
+    """
+
+    def __init__(self, gazetteer: Dict, nearby_km: float = NEARBY_KM):
+        self.states = {state['id']: state['name'] for state in gazetteer['states']}
+        self.cities = {city['id']: city for city in gazetteer['cities']}
+        self.city_state = {city['id']: city['state'] for city in gazetteer['cities']}
+
+        # name/alias -> ('state' | 'city', id); cities win on a clash, so
+        # "delhi" or "chandigarh" mean the city (whose state is implied anyway)
+        self.aliases: Dict[str, Tuple[str, str]] = {}
+        for state in gazetteer['states']:
+            for name in [state['name'], state['id'].lower(), *state.get('aliases', [])]:
+                self.aliases[normalize(name)] = ('state', state['id'])
+        for city in gazetteer['cities']:
+            for name in [city['name'], *city.get('aliases', [])]:
+                self.aliases[normalize(name)] = ('city', city['id'])
+        # Two-letter state codes collide with ordinary words ("in", "or", "up")
+        # in free text; only the full names are matched inside longer strings
+        self._short_codes = {normalize(s['id']) for s in gazetteer['states']}
+
+        self.neighbours: Dict[str, FrozenSet[str]] = {}
+        coordinates = [(c['id'], c['lat'], c['lon']) for c in gazetteer['cities']]
+        for city_id, lat, lon in coordinates:
+            self.neighbours[city_id] = frozenset(
+                other for other, other_lat, other_lon in coordinates
+                if haversine_km(lat, lon, other_lat, other_lon) <= nearby_km
+            )
+
+        self.resolve = lru_cache(maxsize=16384)(self._resolve)
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH) -> 'LocationIndex':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _resolve(self, text: str) -> Place:
+        cities, states, unresolved = set(), set(), []
+        for segment in _SEPARATORS.split((text or '').lower()):
+            segment = normalize(segment)
+            if not segment or segment in IGNORED:
+                continue
+            found = self._lookup_segment(segment)
+            if found:
+                for kind, place_id in found:
+                    (cities if kind == 'city' else states).add(place_id)
+            else:
+                unresolved.append(segment)
+
+        all_states = set(states) | {self.city_state[c] for c in cities}
+        nearby = frozenset().union(*(self.neighbours[c] for c in cities)) if cities else frozenset()
+        return Place(text=normalize(text), cities=frozenset(cities), named_states=frozenset(states),
+                     states=frozenset(all_states), nearby=nearby, unresolved=tuple(unresolved))
+
+    def _lookup_segment(self, segment: str):
+        """Whole-segment alias, else the longest aliases found word by word."""
+        if segment in self.aliases:
+            return [self.aliases[segment]]
+        words = segment.split()
+        found, i = [], 0
+        while i < len(words):
+            for size in range(min(MAX_ALIAS_WORDS, len(words) - i), 0, -1):
+                phrase = ' '.join(words[i:i + size])
+                if phrase in self.aliases and phrase not in self._short_codes:
+                    found.append(self.aliases[phrase])
+                    i += size
+                    break
+            else:
+                i += 1
+        return found
+
+    def matches(self, preference: str, location: str) -> bool:
+        """Whether ``location`` satisfies a student's ``preference``.
+
+        True when a preferred city is (or is near) a city of the location,
+        when a preferred state contains the location, or, for preference
+        segments the gazetteer does not know, when the text appears in the
+        location as it did before the gazetteer existed.
+        """
+        wanted = self.resolve(preference)
+        offered = self.resolve(location)
+        if wanted.nearby & offered.cities:
+            return True
+        if wanted.named_states & offered.states:
+            return True
+        return any(segment in offered.text for segment in wanted.unresolved)
+
+
+_index: LocationIndex | None = None
+
+
+def get_location_index() -> LocationIndex:
+    """Process-wide index, loaded from the gazetteer on first use."""
+    global _index
+    if _index is None:
+        _index = LocationIndex.load()
+    return _index
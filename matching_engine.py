@@ -1,5 +1,38 @@
+import hashlib
+import heapq
+import json
 import math
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Union
+
+import numpy as np
+
+from catalog_index import CatalogIndex, EDUCATION_HIERARCHY, MAX_EDUCATION_LEVEL
+from location_index import get_location_index
+from relevance import DescriptionIndex
+from records import MatchRecord
+
+# Student fields read by calculate_match_score and generate_reasoning
+SCORING_FIELDS = (
+    'skills', 'interests', 'education', 'cgpa', 'location_preference',
+    'location_type', 'category', 'past_participation'
+)
+
+# Weight keys in the order calculate_match_score sums its terms
+CRITERIA = (
+    'skills_match', 'education_match', 'location_preference', 'interest_alignment',
+    'cgpa_score', 'affirmative_action', 'past_participation'
+)
+
+# Cosine similarity between a profile and a posting at which description
+# relevance earns full marks; profile vectors are short, so raw cosines of
+# genuinely relevant postings rarely exceed this
+RELEVANCE_SATURATION = 0.3
+RELEVANCE_CACHE_SIZE = 8
+
+# Bumped whenever a criterion's definition changes, so match lists saved
+# under the old rules stop matching the profile hash
+SCORING_VERSION = 2
 
 class MatchingEngine:
     """AI-powered matching engine for PM Internship Scheme"""
@@ -22,50 +55,438 @@ class MatchingEngine:
             'location_preference': 0.20,
             'description_relevance': 0.20,
         }
+
+        self.location_index = get_location_index()
+        # Recent live batches -> their description index, so every student
+        # matched against the same fetch reuses the posting vectors
+        self._relevance_indexes: Dict[tuple, DescriptionIndex] = {}
+        self._relevance_lock = threading.Lock()
     
-    def find_matches(self, student: Dict[str, Any], internships: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Find and rank internship matches for a student"""
-        matches = []
-        
-        for internship in internships:
-            score = self.calculate_match_score(student, internship)
-            
-            match = {
-                'internship': internship,
-                'score': round(score, 2),
-                'rank': None,  # Will be set after sorting
-                'reasoning': self.generate_reasoning(student, internship, score)
-            }
-            matches.append(match)
-        
-        # Sort by score and assign ranks
-        matches.sort(key=lambda x: x['score'], reverse=True)
-        for i, match in enumerate(matches):
-            match['rank'] = i + 1
-        
-        return matches[:10]  # Return top 10 matches
-    
-    def find_live_matches(self, student: Dict[str, Any], live_internships: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Find and rank live internship matches scraped from Indeed/LinkedIn/Naukri."""
-        matches = []
-        
-        for internship in live_internships:
-            score = self.calculate_live_match_score(student, internship)
-            if score < 15:
-                continue
-            matches.append({
-                'internship': internship,
-                'score': round(score, 1),
-                'rank': None,
-                'reasoning': self.generate_live_reasoning(student, internship, score),
-            })
-        
-        matches.sort(key=lambda x: x['score'], reverse=True)
-        for i, m in enumerate(matches):
-            m['rank'] = i + 1
-        
-        return matches[:20]
-    
+    def find_matches(self, student: Dict[str, Any], internships: Union[List[Dict[str, Any]], CatalogIndex],
+                     top_k: int = 10, include_reasoning: bool = True) -> List[Dict[str, Any]]:
+        """Find and rank internship matches for a student.
+
+        ``internships`` may be a plain list or a prebuilt CatalogIndex; passing
+        the index avoids recompiling the catalog on every call. Candidates
+        come from the index's skill postings and score-bounded groups (see
+        ``_top_k_pruned``), and reasoning is built for the returned rows
+        alone. Pass ``include_reasoning=False`` to skip it entirely and call
+        ``attach_reasoning`` later if needed.
+        """
+        catalog = self._as_catalog(internships)
+        profile = self._compile_student(student, catalog)
+        top = self._top_k_pruned(profile, catalog, top_k)
+
+        matches = [
+            MatchRecord(catalog.internships[j], rounded, rank)
+            for rank, (rounded, _, j) in enumerate(top, start=1)
+        ]
+        if include_reasoning:
+            for match, (_, score, _) in zip(matches, top):
+                match.reasoning = self.generate_reasoning(student, match.internship, score)
+        return matches
+
+    def profile_hash(self, student: Dict[str, Any]) -> str:
+        """Stable digest of everything that affects this student's matches.
+
+        Together with the catalog version it identifies a saved match list,
+        so unchanged profiles can reuse it without rescoring.
+        """
+        payload = {field: student.get(field) for field in SCORING_FIELDS}
+        payload['weights'] = self.weights
+        payload['scoring_version'] = SCORING_VERSION
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def find_live_matches(self, student: Dict[str, Any], live_internships: List[Dict[str, Any]],
+                          top_k: int = 20, include_reasoning: bool = True,
+                          catalog: CatalogIndex | None = None) -> List[Dict[str, Any]]:
+        """Find and rank live internship matches scraped from Indeed/LinkedIn/Naukri.
+
+        The student's fields are normalized once up front, and each posting
+        is normalized and scanned once; the resulting features feed both the
+        score and the reasoning. Description relevance for the whole batch is
+        one TF-IDF pass, weighted by the internal ``catalog``'s descriptions
+        when given; the batch itself never affects the weights, so lists from
+        separate batches can go through merge_live_matches.
+        """
+        profile = self._compile_live_student(student)
+        relevance = self._live_relevance(profile, live_internships, catalog)
+        scored = (
+            (round(score, 1), score, internship, features)
+            for internship, similarity in zip(live_internships, relevance)
+            for features in (self._live_features(profile, internship, similarity),)
+            for score in (self._live_score(profile, features),)
+            if score >= 15
+        )
+        top = heapq.nlargest(top_k, scored, key=lambda x: x[0])
+
+        matches = [
+            MatchRecord(internship, rounded, rank)
+            for rank, (rounded, _, internship, _) in enumerate(top, start=1)
+        ]
+        if include_reasoning:
+            for match, (_, score, _, features) in zip(matches, top):
+                match.reasoning = self._live_reasoning(profile, features, score)
+        return matches
+
+    @staticmethod
+    def merge_live_matches(match_lists: List[List[Dict[str, Any]]], top_k: int = 20) -> List[Dict[str, Any]]:
+        """Combine per-batch find_live_matches results into one ranking.
+
+        Lists come in the order their batches were scored; ties keep that
+        order, as find_live_matches keeps posting order within a batch.
+        """
+        merged = heapq.nlargest(top_k, (m for matches in match_lists for m in matches), key=lambda m: m['score'])
+        for rank, match in enumerate(merged, start=1):
+            match.rank = rank
+        return merged
+
+    def attach_reasoning(self, student: Dict[str, Any], matches: List[Dict[str, Any]],
+                         live: bool = False, catalog: CatalogIndex | None = None) -> List[Dict[str, Any]]:
+        """Fill in 'reasoning' for matches returned without it.
+
+        For live matches pass the ``catalog`` they were scored with, so the
+        relevance behind the reasoning uses the same IDF weights.
+        """
+        for match in matches:
+            if match.get('reasoning') is None:
+                if live:
+                    match['reasoning'] = self.generate_live_reasoning(student, match['internship'], match['score'],
+                                                                      catalog=catalog)
+                else:
+                    match['reasoning'] = self.generate_reasoning(student, match['internship'], match['score'])
+        return matches
+
+    def find_matches_batch(self, students: List[Dict[str, Any]],
+                           internships: Union[List[Dict[str, Any]], CatalogIndex],
+                           top_k: int = 10, chunk_size: int = 256,
+                           include_reasoning: bool = True) -> List[List[Dict[str, Any]]]:
+        """Rank internships for a whole cohort at once.
+
+        Produces the same lists as calling find_matches for each student, but
+        scores students in chunks of ``chunk_size`` as NumPy matrices so the
+        per-pair work happens in vectorized code instead of Python loops.
+        """
+        catalog = self._as_catalog(internships)
+        if not len(catalog):
+            return [[] for _ in students]
+
+        results = []
+        for chunk, scores in self.iter_score_blocks(students, catalog, chunk_size):
+            for student, row in zip(chunk, scores):
+                matches = []
+                for rank, j in enumerate(self._top_k_columns(row, top_k), start=1):
+                    score = float(row[j])
+                    internship = catalog.internships[j]
+                    match = MatchRecord(internship, round(score, 2), rank)
+                    if include_reasoning:
+                        match.reasoning = self.generate_reasoning(student, internship, score)
+                    matches.append(match)
+                results.append(matches)
+        return results
+
+    def iter_score_blocks(self, students: List[Dict[str, Any]], catalog: CatalogIndex,
+                          chunk_size: int = 256):
+        """Yield ``(students_chunk, scores)`` pairs, one score matrix per chunk.
+
+        Peak memory stays at a few ``chunk_size x len(catalog)`` float64 arrays
+        however large the cohort is.
+        """
+        for start in range(0, len(students), chunk_size):
+            chunk = students[start:start + chunk_size]
+            yield chunk, self._score_block(chunk, catalog)
+
+    def score_matrix(self, students: List[Dict[str, Any]],
+                     internships: Union[List[Dict[str, Any]], CatalogIndex]) -> np.ndarray:
+        """Return the students x internships matrix of calculate_match_score values."""
+        catalog = self._as_catalog(internships)
+        if not students or not len(catalog):
+            return np.zeros((len(students), len(catalog)))
+        return self._score_block(students, catalog)
+
+    @staticmethod
+    def _as_catalog(internships: Union[List[Dict[str, Any]], CatalogIndex]) -> CatalogIndex:
+        if isinstance(internships, CatalogIndex):
+            return internships
+        return CatalogIndex(internships)
+
+    def _compile_student(self, student: Dict[str, Any], catalog: CatalogIndex) -> Dict[str, Any]:
+        """Resolve every student-side term once against the catalog's lookup tables."""
+        bonus = self.calculate_affirmative_action_bonus(student, {})
+        skills = student.get('skills', [])
+        return {
+            'skill_mask': catalog.skill_mask(skills),
+            'skill_ids': sorted({catalog.skill_ids[s] for s in skills if s in catalog.skill_ids}),
+            'education_scores': self._education_scores(student.get('education', '')),
+            'location_scores': self._location_scores(student.get('location_preference', ''), catalog),
+            'interest_scores': self._interest_scores(student.get('interests', []), catalog),
+            'cgpa_score': min(student.get('cgpa', 0) / 10.0, 1.0),
+            # Indexed by the internship's affirmative_action_required flag
+            'affirmative_scores': (min(bonus, 1.0), min(bonus + 0.3, 1.0)),
+            'participation_score': self.calculate_participation_score(student),
+        }
+
+    def _top_k_pruned(self, profile: Dict[str, Any], catalog: CatalogIndex, k: int) -> List[tuple]:
+        """Return ``(rounded, score, row)`` for the k best rows, best first.
+
+        Rows sharing a skill with the student are found through the skill
+        postings and scored exactly. Every other row in a feature group has the
+        group's base score, so only its first few members ever need a look.
+        Groups are visited by descending upper bound (skills term at 1.0 when
+        the group holds candidates) and the walk stops once a bound can no
+        longer beat the current k-th score, MaxScore style. Work is therefore
+        proportional to the postings touched plus the number of groups, and
+        the result equals a full scan ranked on the rounded score with catalog
+        order breaking ties.
+        """
+        if k <= 0:
+            return []
+
+        candidates_by_group: Dict[int, List[int]] = {}
+        seen = set()
+        for skill_id in profile['skill_ids']:
+            for j in catalog.skill_postings[skill_id]:
+                if j not in seen:
+                    seen.add(j)
+                    candidates_by_group.setdefault(catalog.group_of[j], []).append(j)
+
+        bounds = []
+        for g, (has_required, level, location, sector, affirmative) in enumerate(catalog.groups):
+            base = self._combine_scores(profile, 0.0 if has_required else 0.5,
+                                        level, location, sector, affirmative)
+            upper = base
+            if g in candidates_by_group:
+                upper = self._combine_scores(profile, 1.0, level, location, sector, affirmative)
+            bounds.append((upper, base, g))
+        bounds.sort(key=lambda b: b[0], reverse=True)
+
+        # Min-heap on (rounded score, -row): the root is the current k-th best
+        heap: List[tuple] = []
+
+        def offer(score: float, j: int) -> bool:
+            entry = (round(score, 2), -j, score)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+                return True
+            if entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+                return True
+            return False
+
+        for upper, base, g in bounds:
+            if len(heap) == k and round(upper, 2) < heap[0][0]:
+                break
+            group_candidates = candidates_by_group.get(g, [])
+            for j in group_candidates:
+                offer(self._score_compiled(profile, catalog, j), j)
+            scored = set(group_candidates)
+            for j in catalog.group_members[g]:
+                if j in scored:
+                    continue
+                # Later members tie on score and lose on catalog order
+                if not offer(base, j):
+                    break
+
+        return [(rounded, score, -neg_j) for rounded, neg_j, score in sorted(heap, reverse=True)]
+
+    def _score_compiled(self, profile: Dict[str, Any], catalog: CatalogIndex, j: int) -> float:
+        """calculate_match_score for a compiled student and catalog row ``j``."""
+        required_count = catalog.required_counts[j]
+        if required_count:
+            skills_score = (catalog.skill_masks[j] & profile['skill_mask']).bit_count() / required_count
+        else:
+            skills_score = 0.5
+        return self._combine_scores(profile, skills_score, catalog.education_levels[j],
+                                    catalog.location_codes[j], catalog.sector_codes[j],
+                                    catalog.affirmative[j])
+
+    def _combine_scores(self, profile: Dict[str, Any], skills_score: float, education_level: int,
+                        location_code: int, sector_code: int, affirmative: bool) -> float:
+        """Weighted total in the same term order as calculate_match_score."""
+        w = self.weights
+        total_score = (
+            skills_score * w['skills_match'] +
+            profile['education_scores'][education_level] * w['education_match'] +
+            profile['location_scores'][location_code] * w['location_preference'] +
+            profile['interest_scores'][sector_code] * w['interest_alignment'] +
+            profile['cgpa_score'] * w['cgpa_score'] +
+            profile['affirmative_scores'][affirmative] * w['affirmative_action'] +
+            profile['participation_score'] * w['past_participation']
+        ) * 100
+
+        return max(0, min(100, total_score))
+
+    def score_ceilings(self, internship: Dict[str, Any], educations: List[str],
+                       locations: List[str]) -> Dict[str, Any]:
+        """Per-student upper bound on the score against one internship, in parts.
+
+        A student's score is at most ``base + per_shared_skill * shared +
+        cgpa * min(cgpa / 10, 1) + participation[past] + education[e] +
+        location[l]``, where ``shared`` counts the required skills they list.
+        The education and location terms are given for the listed values;
+        interest and affirmative action are taken at their maximum. Lets a
+        SQL prefilter rule students out without loading their profiles.
+        """
+        w = self.weights
+        required = set(internship.get('required_skills', []))
+        # Saved scores are rounded, so leave a margin for the rounding
+        base = (w['interest_alignment'] + w['affirmative_action']) * 100 + 0.01
+        if not required:
+            base += 0.5 * w['skills_match'] * 100
+        return {
+            'base': base,
+            'per_shared_skill': w['skills_match'] * 100 / len(required) if required else 0.0,
+            'cgpa': w['cgpa_score'] * 100,
+            'participation': [self.calculate_participation_score({'past_participation': past}) *
+                              w['past_participation'] * 100 for past in (False, True)],
+            'education': {e: self.calculate_education_match(e, internship.get('education_requirement', '')) *
+                          w['education_match'] * 100 for e in educations},
+            'location': {l: self.calculate_location_match(l, internship.get('location', '')) *
+                         w['location_preference'] * 100 for l in locations},
+            'other_education': w['education_match'] * 100,
+            'other_location': w['location_preference'] * 100,
+        }
+
+    @staticmethod
+    def _education_scores(student_education: str) -> List[float]:
+        """calculate_education_match for every possible required level."""
+        student_level = EDUCATION_HIERARCHY.get(student_education.lower(), 0)
+        return [
+            1.0 if student_level >= level else (student_level / level if level > 0 else 0.5)
+            for level in range(MAX_EDUCATION_LEVEL + 1)
+        ]
+
+    def _location_scores(self, student_preference: str, catalog: CatalogIndex) -> List[float]:
+        """calculate_location_match against each distinct catalog location."""
+        if student_preference.lower() == 'any' or not student_preference:
+            return [0.7] * len(catalog.locations)
+        matches = self.location_index.matches
+        return [1.0 if matches(student_preference, location) else 0.3 for location in catalog.locations]
+
+    @staticmethod
+    def _interest_scores(student_interests: List[str], catalog: CatalogIndex) -> List[float]:
+        """calculate_interest_match against each distinct catalog sector."""
+        if not student_interests:
+            return [0.5] * len(catalog.sectors)
+        interests = [interest.lower() for interest in student_interests]
+        return [
+            1.0 if any(interest in sector for interest in interests) else 0.3
+            for sector in catalog.sectors
+        ]
+
+    def component_block(self, students: List[Dict[str, Any]], catalog: CatalogIndex) -> np.ndarray:
+        """Unweighted criterion scores as a float32 ``students x internships x CRITERIA`` array.
+
+        The weighted score is ``components @ weights * 100``, so ranking under
+        other weights needs no rescoring.
+        """
+        components = self._component_blocks(students, catalog)
+        block = np.empty((len(students), len(catalog), len(CRITERIA)), dtype=np.float32)
+        for c, component in enumerate(components):
+            block[:, :, c] = component
+        return block
+
+    def _score_block(self, students: List[Dict[str, Any]], catalog: CatalogIndex) -> np.ndarray:
+        """Score a chunk of students against every internship in the catalog.
+
+        Every term is evaluated in the same order as calculate_match_score so
+        the float64 results are bit-for-bit identical to the per-pair path.
+        """
+        w = self.weights
+        (skills_score, education_score, location_score, interest_score,
+         cgpa_score, affirmative_score, participation_score) = self._component_blocks(students, catalog)
+
+        total = (
+            skills_score * w['skills_match'] +
+            education_score * w['education_match'] +
+            location_score * w['location_preference'] +
+            interest_score * w['interest_alignment'] +
+            cgpa_score * w['cgpa_score'] +
+            affirmative_score * w['affirmative_action'] +
+            participation_score * w['past_participation']
+        ) * 100
+
+        return np.clip(total, 0, 100)
+
+    def _component_blocks(self, students: List[Dict[str, Any]], catalog: CatalogIndex) -> List[np.ndarray]:
+        """Per-criterion float64 scores in CRITERIA order; student-only terms are ``(s, 1)`` columns."""
+        arrays = catalog.arrays
+        n = len(catalog)
+        s = len(students)
+
+        # Shared-skill counts: walk each student's skills through the postings
+        # lists and histogram the (student, internship) hits.
+        hit_rows, hit_cols = [], []
+        for i, student in enumerate(students):
+            for skill in set(student.get('skills', [])):
+                skill_id = catalog.skill_ids.get(skill)
+                if skill_id is not None:
+                    cols = arrays['postings'][skill_id]
+                    hit_cols.append(cols)
+                    hit_rows.append(np.full(len(cols), i, dtype=np.int64))
+        if hit_cols:
+            flat = np.concatenate(hit_rows) * n + np.concatenate(hit_cols)
+            counts = np.bincount(flat, minlength=s * n).reshape(s, n).astype(np.float64)
+        else:
+            counts = np.zeros((s, n))
+        required_counts = np.where(arrays['has_required'], arrays['required_counts'], 1.0)
+        skills_score = np.where(arrays['has_required'], counts / required_counts, 0.5)
+
+        education_table = np.array([self._education_scores(student.get('education', '')) for student in students])
+        education_score = education_table[:, arrays['education_levels']]
+
+        location_rows: Dict[str, List[float]] = {}
+        interest_rows: Dict[tuple, List[float]] = {}
+        location_table = np.empty((s, len(catalog.locations)))
+        interest_table = np.empty((s, len(catalog.sectors)))
+        for i, student in enumerate(students):
+            preference = student.get('location_preference', '')
+            if preference not in location_rows:
+                location_rows[preference] = self._location_scores(preference, catalog)
+            location_table[i] = location_rows[preference]
+            interests = tuple(student.get('interests', []))
+            if interests not in interest_rows:
+                interest_rows[interests] = self._interest_scores(list(interests), catalog)
+            interest_table[i] = interest_rows[interests]
+        location_score = location_table[:, arrays['location_codes']]
+        interest_score = interest_table[:, arrays['sector_codes']]
+
+        cgpa_score = np.array([min(student.get('cgpa', 0) / 10.0, 1.0) for student in students])[:, None]
+
+        # The student-side part of the affirmative bonus is shared by every
+        # internship; the internship flag adds the final 0.3.
+        student_bonus = np.array([
+            self.calculate_affirmative_action_bonus(student, {}) for student in students
+        ])[:, None]
+        affirmative_score = np.where(arrays['affirmative'],
+                                     np.minimum(student_bonus + 0.3, 1.0),
+                                     np.minimum(student_bonus, 1.0))
+
+        participation_score = np.array([
+            self.calculate_participation_score(student) for student in students
+        ])[:, None]
+
+        return [skills_score, education_score, location_score, interest_score,
+                cgpa_score, affirmative_score, participation_score]
+
+    @staticmethod
+    def _top_k_columns(row: np.ndarray, k: int) -> List[int]:
+        """Column indices of the k best scores, ordered like find_matches.
+
+        find_matches sorts on the score rounded to two decimals and keeps
+        catalog order for ties. Rounding moves a value by at most 0.005, so
+        only columns within 0.01 of the k-th raw score can still tie with it.
+        """
+        n = row.shape[0]
+        if k < n:
+            kth = np.partition(row, n - k)[n - k]
+            columns = np.flatnonzero(row >= kth - 0.01)
+        else:
+            columns = np.arange(n)
+        ranked = sorted(columns.tolist(), key=lambda j: -round(float(row[j]), 2))
+        return ranked[:k]
+
     def calculate_match_score(self, student: Dict[str, Any], internship: Dict[str, Any]) -> float:
         """Calculate matching score between student and internship"""
         
@@ -117,19 +538,8 @@ class MatchingEngine:
     
     def calculate_education_match(self, student_education: str, required_education: str) -> float:
         """Calculate education level matching"""
-        education_hierarchy = {
-            'high school': 1,
-            '12th': 2,
-            'diploma': 3,
-            'undergraduate': 4,
-            'bachelor': 4,
-            'postgraduate': 5,
-            'master': 5,
-            'phd': 6
-        }
-        
-        student_level = education_hierarchy.get(student_education.lower(), 0)
-        required_level = education_hierarchy.get(required_education.lower(), 0)
+        student_level = EDUCATION_HIERARCHY.get(student_education.lower(), 0)
+        required_level = EDUCATION_HIERARCHY.get(required_education.lower(), 0)
         
         if student_level >= required_level:
             return 1.0
@@ -141,7 +551,7 @@ class MatchingEngine:
         if student_preference.lower() == 'any' or not student_preference:
             return 0.7
         
-        if student_preference.lower() in internship_location.lower():
+        if self.location_index.matches(student_preference, internship_location):
             return 1.0
         else:
             return 0.3
@@ -205,7 +615,8 @@ class MatchingEngine:
             reasons.append("Education requirement satisfied")
         
         # Location preference
-        if student.get('location_preference', '').lower() in internship.get('location', '').lower():
+        preference = student.get('location_preference', '')
+        if preference.lower() != 'any' and self.location_index.matches(preference, internship.get('location', '')):
             reasons.append("Location preference matches")
         
         # CGPA consideration
@@ -224,33 +635,98 @@ class MatchingEngine:
         
         return reasons[:5]  # Limit to top 5 reasons
 
-    def calculate_live_match_score(self, student: Dict[str, Any], internship: Dict[str, Any]) -> float:
-        """Calculate match score for a live (scraped) internship against student profile."""
-        student_skills = set(s.lower() for s in student.get('skills', []))
+    def calculate_live_match_score(self, student: Dict[str, Any], internship: Dict[str, Any],
+                                   catalog: CatalogIndex | None = None) -> float:
+        """Calculate match score for a live (scraped) internship against student profile.
+
+        Pass the internal ``catalog`` for the same description IDF weights
+        find_live_matches uses; one posting alone says nothing about which
+        terms are rare.
+        """
+        profile = self._compile_live_student(student)
+        similarity = self._live_relevance(profile, [internship], catalog, cache=False)[0]
+        return self._live_score(profile, self._live_features(profile, internship, similarity))
+
+    def generate_live_reasoning(self, student: Dict[str, Any], internship: Dict[str, Any], score: float,
+                                catalog: CatalogIndex | None = None) -> List[str]:
+        """Generate reasoning for live internship matches; ``catalog`` as in calculate_live_match_score."""
+        profile = self._compile_live_student(student)
+        similarity = self._live_relevance(profile, [internship], catalog, cache=False)[0]
+        return self._live_reasoning(profile, self._live_features(profile, internship, similarity), score)
+
+    @staticmethod
+    def _compile_live_student(student: Dict[str, Any]) -> Dict[str, Any]:
+        """Lowercased skills, interests and location preference, built once per student."""
+        return {
+            'skills': set(s.lower() for s in student.get('skills', [])),
+            'interests': set(i.lower() for i in student.get('interests', [])),
+            'location_pref': student.get('location_preference', '').lower(),
+            'text': ' '.join([*student.get('skills', []), *student.get('interests', []),
+                              str(student.get('experience') or '')]),
+        }
+
+    def _live_relevance(self, profile: Dict[str, Any], live_internships: List[Dict[str, Any]],
+                        catalog: CatalogIndex | None = None, cache: bool = True) -> np.ndarray:
+        """TF-IDF cosine similarity of the profile with each posting's title and description.
+
+        Batch indexes are kept for reuse by the next student; ``cache=False``
+        is for one-off postings that would only evict them.
+        """
+        documents = tuple(f"{internship.get('title', '')} {internship.get('description', '')}"
+                          for internship in live_internships)
+        key = (documents, id(catalog), catalog.version if catalog is not None else None)
+        with self._relevance_lock:
+            index = self._relevance_indexes.get(key) if cache else None
+        if index is None:
+            index = DescriptionIndex(
+                list(documents),
+                background=catalog.description_frequencies if catalog is not None else None,
+            )
+            if cache:
+                with self._relevance_lock:
+                    if len(self._relevance_indexes) >= RELEVANCE_CACHE_SIZE:
+                        self._relevance_indexes.pop(next(iter(self._relevance_indexes)), None)
+                    self._relevance_indexes[key] = index
+        return index.scores(index.query_vector(profile['text']))
+
+    def _live_features(self, profile: Dict[str, Any], internship: Dict[str, Any],
+                       relevance: float = 0.0) -> Dict[str, Any]:
+        """Everything scoring and reasoning read from one posting, normalized once."""
         internship_skills = set(s.lower() for s in internship.get('skills_extracted', []))
+        location_pref = profile['location_pref']
+        text = (internship.get('title', '') + ' ' + internship.get('company', '') + ' ' + internship.get('description', '')).lower()
+        return {
+            'skills': internship_skills,
+            'matched_skills': profile['skills'] & internship_skills,
+            # A few C-level substring searches beat one combined regex pass
+            # for the handful of interests a profile carries
+            'interest_hits': {i for i in profile['interests'] if i in text},
+            'location_match': (location_pref not in ('', 'any')
+                               and self.location_index.matches(location_pref, internship.get('location', ''))),
+            'relevance': float(relevance),
+        }
 
+    def _live_score(self, profile: Dict[str, Any], features: Dict[str, Any]) -> float:
+        internship_skills = features['skills']
         if internship_skills:
-            skills_overlap = len(student_skills & internship_skills)
+            skills_overlap = len(features['matched_skills'])
             skills_score = min(skills_overlap / max(len(internship_skills), 1), 1.0)
         else:
             skills_score = 0.5
 
-        student_interests = set(i.lower() for i in student.get('interests', []))
-        text = (internship.get('title', '') + ' ' + internship.get('company', '') + ' ' + internship.get('description', '')).lower()
-        interest_matches = sum(1 for i in student_interests if i in text)
+        student_interests = profile['interests']
+        interest_matches = len(features['interest_hits'])
         interest_score = min(interest_matches / max(len(student_interests), 1), 1.0) if student_interests else 0.5
 
-        location_pref = student.get('location_preference', '').lower()
-        loc = internship.get('location', '').lower()
+        location_pref = profile['location_pref']
         if location_pref == 'any' or not location_pref:
             location_score = 0.7
-        elif location_pref in loc or any(city in loc for city in location_pref.split(',')):
+        elif features['location_match']:
             location_score = 1.0
         else:
             location_score = 0.3
 
-        desc_length = len(internship.get('description', ''))
-        desc_score = min(desc_length / 100, 1.0)
+        desc_score = min(features['relevance'] / RELEVANCE_SATURATION, 1.0)
 
         total = (
             skills_score * self.weights_live['skills_match'] +
@@ -261,27 +737,22 @@ class MatchingEngine:
 
         return max(0, min(100, total))
 
-    def generate_live_reasoning(self, student: Dict[str, Any], internship: Dict[str, Any], score: float) -> List[str]:
-        """Generate reasoning for live internship matches."""
+    def _live_reasoning(self, profile: Dict[str, Any], features: Dict[str, Any], score: float) -> List[str]:
         reasons = []
-        student_skills = set(s.lower() for s in student.get('skills', []))
-        internship_skills = set(s.lower() for s in internship.get('skills_extracted', []))
-
-        matched = student_skills & internship_skills
+        matched = features['matched_skills']
         if matched:
             reasons.append(f"Skills match: {', '.join(list(matched)[:4])}")
 
-        student_interests = set(i.lower() for i in student.get('interests', []))
-        text = (internship.get('title', '') + ' ' + internship.get('description', '')).lower()
-        interest_hits = [i for i in student_interests if i in text]
+        interest_hits = [i for i in profile['interests'] if i in features['interest_hits']]
         if interest_hits:
             reasons.append(f"Matches interests: {', '.join(list(interest_hits)[:3])}")
 
-        location_pref = student.get('location_preference', '').lower()
-        loc = internship.get('location', '').lower()
-        if location_pref and location_pref in loc:
+        if features['location_match']:
             reasons.append("Location matches your preference")
 
+        if features['relevance'] >= RELEVANCE_SATURATION:
+            reasons.append("Description closely fits your profile")
+
         if score >= 70:
             reasons.append("Strong match — highly recommended")
         elif score >= 45:
@@ -0,0 +1,126 @@
+"""
+Record types
+Slotted stand-ins for the student, internship and match dicts. Each keeps the
+read-only mapping interface (``record['skills']``, ``record.get(...)``) so the
+engine, routes and templates accept records and plain dicts alike.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+class _MappingRecord(Mapping):
+    """Dict-style read access over a slotted dataclass's fields."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self}
+
+    @classmethod
+    def from_row(cls, row: Mapping):
+        """Build a record from a dict or database row, ignoring unknown keys."""
+        return cls(**{key: row[key] for key in cls.__slots__ if key in row})
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class InternshipRecord(_MappingRecord):
+    """One catalog internship; immutable so every match can share it."""
+
+    id: str
+    title: str = ''
+    organization: str = ''
+    sector: str = ''
+    location: str = ''
+    duration: str = ''
+    stipend: Optional[int] = None
+    required_skills: Tuple[str, ...] = ()
+    education_requirement: str = ''
+    description: str = ''
+    capacity: Optional[int] = None
+    affirmative_action_required: bool = False
+    apply_url: str = ''
+
+    def __post_init__(self):
+        object.__setattr__(self, 'required_skills', tuple(self.required_skills or ()))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class StudentRecord(_MappingRecord):
+    """One student profile as loaded from the database."""
+
+    id: str
+    name: str = ''
+    email: str = ''
+    phone: str = ''
+    age: Optional[int] = None
+    education: str = ''
+    college: str = ''
+    cgpa: Optional[float] = None
+    skills: Tuple[str, ...] = ()
+    interests: Tuple[str, ...] = ()
+    location_preference: str = ''
+    location_type: str = ''
+    category: str = ''
+    experience: str = ''
+    past_participation: bool = False
+    created_at: str = ''
+    password: str = ''
+    email_verified: bool = False
+    verification_token: str = ''
+    revision: int = 0
+
+    def __post_init__(self):
+        object.__setattr__(self, 'skills', tuple(self.skills or ()))
+        object.__setattr__(self, 'interests', tuple(self.interests or ()))
+
+
+@dataclass(slots=True, eq=False)
+class MatchRecord(_MappingRecord):
+    """One ranked result. ``internship`` is a reference, never a copy.
+
+    Unset optional fields are left out of the mapping view, so a record
+    serializes to the same JSON as the dicts it replaces.
+    """
+
+    internship: Mapping
+    score: float
+    rank: int
+    reasoning: Optional[list] = None
+    source: Optional[str] = None
+
+    def __getitem__(self, key: str) -> Any:
+        value = _MappingRecord.__getitem__(self, key)
+        if value is None and key in ('reasoning', 'source'):
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return (key for key in self.__slots__ if getattr(self, key) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def to_json(value: Any) -> Any:
+    """``json.dumps`` default hook for record types."""
+    if isinstance(value, _MappingRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
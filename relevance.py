@@ -0,0 +1,98 @@
+"""
+Description relevance
+A small TF-IDF engine over internship descriptions: postings are vectorized
+once into an inverted index, and a student's skills, interests and experience
+score against every posting in one pass of sparse dot products. Pure Python
+and numpy, so it runs offline with nothing to download.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Callable, List, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r'[a-z][a-z0-9+#]*')
+
+STOP_WORDS = frozenset("""
+    a about all also an and are as at be by can for from has have in into is it its
+    of on or our that the their this to we will with you your who work working
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; keeps ``c++``/``c#`` and drops stop words and single letters."""
+    return [t for t in _TOKEN.findall((text or '').lower()) if len(t) > 1 and t not in STOP_WORDS]
+
+
+class DocumentFrequencies:
+    """How many documents of a corpus contain each term."""
+
+    def __init__(self, documents: Iterable[str] = ()):
+        self.counts: Counter = Counter()
+        self.documents = 0
+        for text in documents:
+            self.add(tokenize(text))
+
+    def add(self, tokens: List[str]):
+        self.counts.update(set(tokens))
+        self.documents += 1
+
+    def idf(self, term: str) -> float:
+        # Smoothed, so a term seen in every document still carries weight
+        return math.log((1 + self.documents) / (1 + self.counts.get(term, 0))) + 1.0
+
+
+def tfidf_vector(tokens: List[str], idf: Callable[[str], float]) -> Dict[str, float]:
+    """L2-normalized sublinear TF-IDF weights of one token list."""
+    weights = {term: (1.0 + math.log(count)) * idf(term) for term, count in Counter(tokens).items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {term: w / norm for term, w in weights.items()} if norm else {}
+
+
+class DescriptionIndex:
+    """TF-IDF vectors of a batch of documents, stored as an inverted index.
+
+    ``vectors[j]`` is document ``j``'s sparse vector; ``postings`` maps each
+    term to the rows containing it and their weights, so ``scores`` computes
+    a query's cosine similarity with every document at once.
+
+    IDF weights come from ``background`` alone, never from the batch itself,
+    so a document scores the same whichever batch it arrives in and scores
+    from separately indexed batches can be merged. Without a background
+    every term weighs the same.
+    """
+
+    def __init__(self, documents: List[str], background: Optional[DocumentFrequencies] = None):
+        tokens = [tokenize(text) for text in documents]
+        self.frequencies = background if background is not None else DocumentFrequencies()
+        idf = {term: self.frequencies.idf(term) for term in set().union(*tokens)}
+        self.vectors = [tfidf_vector(document, idf.__getitem__) for document in tokens]
+
+        rows: Dict[str, List[Tuple[int, float]]] = {}
+        for j, vector in enumerate(self.vectors):
+            for term, weight in vector.items():
+                rows.setdefault(term, []).append((j, weight))
+        self.postings = {
+            term: (np.array([j for j, _ in entries], dtype=np.int64),
+                   np.array([w for _, w in entries], dtype=np.float64))
+            for term, entries in rows.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def query_vector(self, text: str) -> Dict[str, float]:
+        # Terms no document uses cannot score, but they still count towards
+        # the norm so a long profile is not inflated by its few hits
+        return tfidf_vector(tokenize(text), self.frequencies.idf)
+
+    def scores(self, query: Dict[str, float]) -> np.ndarray:
+        """Cosine similarity of ``query`` with every document."""
+        result = np.zeros(len(self.vectors))
+        for term, weight in query.items():
+            hit = self.postings.get(term)
+            if hit is not None:
+                result[hit[0]] += weight * hit[1]
+        return result
@@ -0,0 +1,135 @@
+"""
+Incremental rematching
+Keeps the saved top-10 lists in ``matches`` current after a single catalog
+edit without rerunning the whole cohort.
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from catalog_index import CatalogIndex
+from matching_engine import MatchingEngine
+from records import MatchRecord
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalRematcher:
+    """Applies one internship insert, update or delete to the saved match lists.
+
+    Only the students the edit could affect are loaded (see
+    ``DataManager.get_rematch_candidates``), and the changed internship is
+    scored against them in one vectorized pass. A list is rewritten only when
+    the new score beats its current last place, or when it contains the
+    changed or deleted internship; only those students are rescored against
+    the full catalog.
+
+    Each call names the catalog version its edit produced. If the catalog
+    has moved on by the time it runs, the call does nothing: the saved lists
+    then carry an older version and are recomputed when next requested.
+    Otherwise the row is merged only into lists saved for the previous
+    version and the student's current profile; other affected lists are
+    rematched in full, and every list left as it was is moved to the new
+    version in one UPDATE.
+    """
+
+    def __init__(self, data_manager, engine: MatchingEngine, top_k: int = 10):
+        self.data_manager = data_manager
+        self.engine = engine
+        self.top_k = top_k
+
+    def internship_changed(self, internship_id: str, version: int) -> int:
+        """Rematch after an add or update; returns the number of lists rewritten."""
+        catalog = self._catalog_at(version)
+        if catalog is None or internship_id not in catalog.positions:
+            return 0
+        position = catalog.positions
+        internship = catalog.internships[position[internship_id]]
+
+        preferences = self.data_manager.get_student_preferences()
+        ceilings = self.engine.score_ceilings(internship, preferences['education'],
+                                              preferences['location_preference'])
+        candidates = self.data_manager.get_rematch_candidates(internship_id, self.top_k, ceilings)
+        saved = {row['student_id']: row for row in self.data_manager.get_matches(candidates)}
+        students = self.data_manager.get_students_by_ids(list(saved))
+        scores = self.engine.score_matrix(students, [internship])[:, 0] if students else []
+
+        updated = 0
+        for student, score in zip(students, scores):
+            run = saved[student['id']]
+            if self._needs_full_rematch(run, student, version, internship_id):
+                new_matches = self.engine.find_matches(student, catalog, top_k=self.top_k)
+            else:
+                new_matches = self._merge(run['matches'], internship, float(score), position)
+                if new_matches is None:
+                    continue
+            self._save(student, new_matches, catalog)
+            updated += 1
+        self.data_manager.advance_match_versions(version - 1, version)
+
+        logger.info(f"Incremental rematch for {internship_id}: {updated}/{len(students)} lists updated")
+        return updated
+
+    def internship_deleted(self, internship_id: str, version: int) -> int:
+        """Rematch the students whose saved list contained a deleted internship."""
+        catalog = self._catalog_at(version)
+        if catalog is None:
+            return 0
+        updated = 0
+        # Saved lists no longer show the deleted row, but match_results still
+        # records who had it
+        students = self.data_manager.get_students_by_ids(self.data_manager.get_students_matched_to(internship_id))
+        for student in students:
+            self._save(student, self.engine.find_matches(student, catalog, top_k=self.top_k), catalog)
+            updated += 1
+        self.data_manager.advance_match_versions(version - 1, version)
+
+        logger.info(f"Incremental rematch after deleting {internship_id}: {updated} lists updated")
+        return updated
+
+    def _catalog_at(self, version: int) -> Optional[CatalogIndex]:
+        """The current catalog, or None when edits after ``version`` have landed."""
+        catalog = self.data_manager.get_catalog_index()
+        if catalog.version != version:
+            logger.info(f"Skipping rematch for catalog version {version}; catalog is at {catalog.version}")
+            return None
+        return catalog
+
+    def _needs_full_rematch(self, run: Dict[str, Any], student: Dict[str, Any], version: int,
+                            internship_id: str) -> bool:
+        # Merging is only sound into a list that was current just before the
+        # edit; the edited row may also have dropped below rows not in the list
+        return (
+            run['catalog_version'] != version - 1
+            or run['profile_hash'] != self.engine.profile_hash(student)
+            or any(m['internship'].get('id') == internship_id for m in run['matches'])
+        )
+
+    def _merge(self, matches: List[Dict[str, Any]], internship: Dict[str, Any], score: float,
+               position: Dict[str, int]) -> Optional[List[Dict[str, Any]]]:
+        """Insert the new row if it makes the top-k; None when the list is unchanged.
+
+        Saved rows carry no reasoning; it is attached when the list is read.
+        """
+        # Same ordering as find_matches: rounded score, then catalog order
+        def key(match):
+            return match['score'], -position[match['internship']['id']]
+
+        candidate = MatchRecord(internship, round(score, 2), 0)
+        if len(matches) >= self.top_k and key(candidate) <= min(key(m) for m in matches):
+            return None
+
+        merged = sorted(matches + [candidate], key=key, reverse=True)[:self.top_k]
+        for rank, match in enumerate(merged, start=1):
+            match['rank'] = rank
+        return merged
+
+    def _save(self, student: Dict[str, Any], matches: List[Dict[str, Any]], catalog: CatalogIndex):
+        self.data_manager.add_match({
+            'student_id': student['id'],
+            'matches': matches,
+            'timestamp': datetime.now().isoformat(),
+            'profile_hash': self.engine.profile_hash(student),
+            'catalog_version': catalog.version,
+        })
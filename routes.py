@@ -1,9 +1,15 @@
-from flask import render_template, request, session, redirect, url_for, jsonify, flash, make_response
+from flask import render_template, request, session, redirect, url_for, jsonify, flash, make_response, g
 from app import app
 from data_manager import DataManager
 from matching_engine import MatchingEngine
+from allocation import clamp_time_budget
+from component_store import ComponentStore, resolve_weights
+from jobs import JobManager, MATCH_ALL, ALLOCATE
+from shadow import ReferenceServedEngine, ShadowRunner, Tolerances
 from internship_fetcher import InternshipFetcher
 from email_utils import BASE_URL
+from db_config import pool_stats
+from identity_cache import TTLCache
 from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
 import os
@@ -11,11 +17,27 @@ import tempfile
 import logging
 from datetime import datetime
 from functools import wraps
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
 data_manager = DataManager()
-matching_engine = MatchingEngine()
+# MATCHING_ENGINE=reference serves matches with the pre-optimization scorer
+matching_engine = ReferenceServedEngine() if os.environ.get('MATCHING_ENGINE') == 'reference' else MatchingEngine()
+shadow_runner = ShadowRunner(data_manager, matching_engine,
+                             sample_rate=float(os.environ.get('SHADOW_SAMPLE_RATE', '0')),
+                             tolerances=Tolerances.from_env())
+job_manager = JobManager(data_manager, matching_engine)
+component_store = ComponentStore(data_manager, matching_engine)
+# Rows per page in the admin lists
+ADMIN_PAGE_SIZE = 50
+# Seconds live matching waits for the slowest job platform before rendering
+LIVE_FETCH_DEADLINE = float(os.environ.get('LIVE_FETCH_DEADLINE', '20'))
+# Seconds a session's student or admin record is reused before it is re-read;
+# other workers see a deletion once their copy expires
+identity_cache = TTLCache(ttl=float(os.environ.get('IDENTITY_CACHE_TTL', '30')))
+# Endpoints that never look at the session, so they skip its validation
+SESSIONLESS_ENDPOINTS = {'static', 'health_check', 'robots_txt', 'sitemap_xml'}
 
 @app.after_request
 def add_security_headers(response):
@@ -74,16 +96,52 @@ def sitemap_xml():
 def health_check():
     return jsonify({'status': 'healthy', 'service': 'Prayaas'}), 200
 
+def _load_identity(kind, key, loader):
+    """A student or admin record, read from the database at most once per request.
+
+    Looks in ``g.identities`` first, then ``identity_cache``, then calls
+    ``loader``; missing records are not cached. A cached record is reused
+    only while its row's trigger-maintained ``revision`` is unchanged, so an
+    update or deletion through any worker is seen on the next request. On
+    a hit that check is the one read; a miss reads the row, revision
+    included, instead.
+    """
+    identities = g.setdefault('identities', {})
+    if (kind, key) not in identities:
+        record = identity_cache.get((kind, key))
+        if record is not None:
+            revision = data_manager.get_identity_revision(kind, key)
+            if revision != record['revision']:
+                identity_cache.invalidate((kind, key))
+                record = None if revision is None else loader(key)
+                identity_cache.set((kind, key), record)
+        else:
+            record = loader(key)
+            identity_cache.set((kind, key), record)
+        identities[(kind, key)] = record
+    return identities[(kind, key)]
+
+def _read_only_admin(admin_id):
+    # Cached records are shared by concurrent requests, so none may be mutable
+    admin = data_manager.get_admin_by_id(admin_id)
+    return MappingProxyType(admin) if admin else None
+
+def cached_student(student_id):
+    return _load_identity('student', student_id, data_manager.get_student)
+
+def cached_admin(admin_id):
+    return _load_identity('admin', admin_id, _read_only_admin)
+
 @app.before_request
 def validate_session():
     """Validate session on every request - clear stale sessions"""
+    if request.endpoint in SESSIONLESS_ENDPOINTS:
+        return
     if session.get('student_id'):
-        student = data_manager.get_student(session['student_id'])
-        if not student:
+        if not cached_student(session['student_id']):
             session.clear()
     if session.get('admin_id') and session.get('is_admin'):
-        admin = data_manager.get_admin_by_id(session['admin_id'])
-        if not admin:
+        if not cached_admin(session['admin_id']):
             session.clear()
 
 def admin_required(f):
@@ -103,7 +161,7 @@ def student_required(f):
         if not session.get('student_id'):
             flash('Please login or register to continue.', 'error')
             return redirect(url_for('student_login'))
-        student = data_manager.get_student(session['student_id'])
+        student = cached_student(session['student_id'])
         if not student:
             session.clear()
             flash('Session expired. Please login again.', 'error')
@@ -113,15 +171,14 @@ def student_required(f):
 
 @app.route('/')
 def index():
-    students = data_manager.get_all_students()
-    internships = data_manager.get_all_internships()
-    matches = data_manager.get_all_matches()
+    # Trigger-maintained counters: one small read whatever the cohort size
+    counts = data_manager.get_stats()
     
     stats = {
-        'total_students': len(students),
-        'total_internships': len(internships),
-        'total_matches': len(matches),
-        'match_rate': (len(matches) / len(students) * 100) if len(students) > 0 else 0
+        'total_students': counts['students'],
+        'total_internships': counts['internships'],
+        'total_matches': counts['matches'],
+        'match_rate': (counts['matches'] / counts['students'] * 100) if counts['students'] > 0 else 0
     }
     
     return render_template('index.html', stats=stats)
@@ -162,39 +219,43 @@ def student_login():
 @student_required
 def student_dashboard():
     student_id = session.get('student_id')
-    student = data_manager.get_student(student_id)
+    student = cached_student(student_id)
     return render_template('student_dashboard.html', student=student)
 
 @app.route('/admin')
 @admin_required
 def admin_dashboard():
-    students = data_manager.get_all_students()
-    internships = data_manager.get_all_internships()
-    matches = data_manager.get_all_matches()
-    
-    # Calculate statistics
-    total_students = len(students)
-    total_internships = len(internships)
-    total_matches = len(matches)
+    # One keyset page of each list; the rest is reached through its next link
+    search = request.args.get('q', '').strip()
+    students, students_next = data_manager.list_students(
+        after=request.args.get('students_after', type=int), limit=ADMIN_PAGE_SIZE, search=search)
+    matches, matches_next = data_manager.list_match_runs(
+        after=request.args.get('matches_after', type=int), limit=ADMIN_PAGE_SIZE, search=search)
+    internships, _ = data_manager.list_internships(limit=6)
     
-    # Calculate affirmative action stats
-    rural_students = len([s for s in students if s.get('location_type') == 'rural'])
-    sc_st_students = len([s for s in students if s.get('category') in ['SC', 'ST']])
+    # Totals and affirmative action counts come from SQL-side counters
+    counts = data_manager.get_stats()
     
     stats = {
-        'total_students': total_students,
-        'total_internships': total_internships,
-        'total_matches': total_matches,
-        'rural_students': rural_students,
-        'sc_st_students': sc_st_students,
-        'match_rate': (total_matches / total_students * 100) if total_students > 0 else 0
+        'total_students': counts['students'],
+        'total_internships': counts['internships'],
+        'total_matches': counts['matches'],
+        'rural_students': counts['rural_students'],
+        'sc_st_students': counts['sc_st_students'],
+        'match_rate': (counts['matches'] / counts['students'] * 100) if counts['students'] > 0 else 0
     }
     
+    active_job = data_manager.get_active_job(MATCH_ALL)
+    
     return render_template('admin_dashboard.html', 
                          students=students, 
+                         students_next=students_next,
                          internships=internships, 
                          matches=matches,
-                         stats=stats)
+                         matches_next=matches_next,
+                         search=search,
+                         stats=stats,
+                         active_job_id=active_job['id'] if active_job else '')
 
 @app.route('/profile', methods=['GET', 'POST'])
 def profile_form():
@@ -241,19 +302,33 @@ def run_matching(student_id):
         flash('Access denied. You can only access your own profile.', 'error')
         return redirect(url_for('student_dashboard'))
     
-    student = data_manager.get_student(student_id)
+    student = cached_student(student_id)
     if not student:
         flash('Student not found!', 'error')
         return redirect(url_for('student_dashboard'))
     
+    # Reuse the saved results while neither the profile nor the catalog has changed
+    profile_hash = matching_engine.profile_hash(student)
+    saved = data_manager.get_match(student_id)
+    if (saved and saved.get('profile_hash') == profile_hash
+            and saved.get('catalog_version') == data_manager.get_catalog_version()):
+        # Reasoning is not stored with the list; derive it for display
+        return render_template('matching_results.html',
+                             student=student,
+                             matches=matching_engine.attach_reasoning(student, saved['matches']))
+    
     # Run matching algorithm
-    matches = matching_engine.find_matches(student, data_manager.get_all_internships())
+    catalog = data_manager.get_catalog_index()
+    matches = matching_engine.find_matches(student, catalog)
+    shadow_runner.observe(student, catalog, matches)
     
     # Save match results
     match_data = {
         'student_id': student_id,
         'matches': matches,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'profile_hash': profile_hash,
+        'catalog_version': catalog.version,
     }
     data_manager.add_match(match_data)
     
@@ -261,6 +336,27 @@ def run_matching(student_id):
                          student=student, 
                          matches=matches)
 
+def match_with_live(student, query='', location='', skills=None, max_per_platform=10):
+    """Internal and live matches, with the scrapes in flight while the catalog is scored.
+
+    Each platform's postings are scored as soon as they arrive, so the wait
+    is the slowest platform (capped at LIVE_FETCH_DEADLINE from the moment
+    the scrapes start) rather than the sum of all of them plus scoring.
+    Relevance IDF comes from the catalog alone, so the per-platform lists
+    are comparable. Returns (internal, live, live_fetched).
+    """
+    catalog = data_manager.get_catalog_index()
+    arrivals = InternshipFetcher().fetch_iter(query=query, location=location, skills=skills,
+                                              max_per_platform=max_per_platform, timeout=LIVE_FETCH_DEADLINE)
+
+    internal_matches = matching_engine.find_matches(student, catalog)
+
+    live_lists, fetched = [], 0
+    for platform, postings in arrivals:
+        fetched += len(postings)
+        live_lists.append(matching_engine.find_live_matches(student, postings, catalog=catalog))
+    return internal_matches, matching_engine.merge_live_matches(live_lists), fetched
+
 @app.route('/live-match/<student_id>')
 @student_required
 def live_match(student_id):
@@ -269,7 +365,7 @@ def live_match(student_id):
         flash('Access denied.', 'error')
         return redirect(url_for('student_dashboard'))
     
-    student = data_manager.get_student(student_id)
+    student = cached_student(student_id)
     if not student:
         flash('Student not found!', 'error')
         return redirect(url_for('student_dashboard'))
@@ -277,24 +373,19 @@ def live_match(student_id):
     location = request.args.get('location', student.get('location_preference', ''))
     search_query = request.args.get('query', '')
     
-    # Fetch live internships from external platforms
-    fetcher = InternshipFetcher()
-    live_internships = fetcher.fetch_all(
+    # Internal catalog matches are scored while the live platforms are scraped
+    internal_matches, live_matches, live_fetched = match_with_live(
+        student,
         query=search_query,
         location=location,
         skills=student.get('skills', []),
         max_per_platform=12
     )
     
-    live_matches = matching_engine.find_live_matches(student, live_internships)
-    
-    # Also include internal database matches
-    internal_internships = data_manager.get_all_internships()
-    internal_matches = matching_engine.find_matches(student, internal_internships)
-    
-    # Convert internal matches to same format as live matches
+    # Convert internal matches to same format as live matches; the catalog
+    # dicts are shared through the cached index, so tag a copy
     for m in internal_matches:
-        m['internship']['platform'] = 'Prayaas Database'
+        m['internship'] = dict(m['internship'], platform='Prayaas Database')
         m['source'] = 'internal'
     
     for m in live_matches:
@@ -311,7 +402,7 @@ def live_match(student_id):
                          search_query=search_query,
                          location=location,
                          platforms_found=platforms_found,
-                         total_fetched=len(live_internships) + len(internal_internships))
+                         total_fetched=live_fetched + len(data_manager.get_catalog_index()))
 
 @app.route('/admin/login', methods=['GET', 'POST'])
 def admin_login():
@@ -343,25 +434,146 @@ def admin_signup():
     flash('Admin registration is not available. Please contact the system administrator.', 'error')
     return redirect(url_for('admin_login'))
 
-@app.route('/api/match-all')
+@app.route('/api/match-all', methods=['POST'])
 @admin_required
 def match_all_students():
-    """API endpoint to run matching for all students"""
-    students = data_manager.get_all_students()
-    internships = data_manager.get_all_internships()
-    
-    all_matches = []
-    for student in students:
-        matches = matching_engine.find_matches(student, internships)
-        match_data = {
-            'student_id': student['id'],
-            'matches': matches,
-            'timestamp': datetime.now().isoformat()
-        }
-        data_manager.add_match(match_data)
-        all_matches.append(match_data)
-    
-    return jsonify({'success': True, 'total_matches': len(all_matches)})
+    """API endpoint to start matching for all students as a background job"""
+    job_id = job_manager.submit_match_all()
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('job_status', job_id=job_id),
+    }), 202
+
+@app.route('/api/match-all', methods=['GET'])
+@admin_required
+def match_all_status():
+    """Latest batch matching job; starting one takes a POST"""
+    job = data_manager.get_latest_job(MATCH_ALL)
+    return jsonify({'success': True, 'job': _job_summary(job) if job else None})
+
+def _job_summary(job):
+    total = job['progress_total'] or 0
+    return {
+        'id': job['id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'progress_done': job['progress_done'],
+        'progress_total': total,
+        'percent': round(job['progress_done'] / total * 100, 1) if total else 0,
+        'cancel_requested': job['cancel_requested'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'finished_at': job['finished_at'],
+    }
+
+@app.route('/api/jobs/<job_id>')
+@admin_required
+def job_status(job_id):
+    """Progress of a background job"""
+    job = data_manager.get_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': _job_summary(job)})
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+@admin_required
+def cancel_job(job_id):
+    """Ask a background job to stop after its current shard"""
+    if not data_manager.get_job(job_id):
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if not data_manager.request_job_cancel(job_id):
+        return jsonify({'success': False, 'error': 'Job has already finished'}), 409
+    return jsonify({'success': True})
+
+@app.route('/api/jobs/<job_id>/result')
+@admin_required
+def job_result(job_id):
+    """Summary of a finished background job"""
+    job = data_manager.get_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if job['status'] in ('queued', 'running'):
+        return jsonify({'success': False, 'error': 'Job is still running', 'job': _job_summary(job)}), 409
+    return jsonify({'success': job['status'] == 'completed', 'job': _job_summary(job), 'result': job['result']})
+
+@app.route('/api/allocate', methods=['POST'])
+@admin_required
+def start_allocation():
+    """API endpoint to solve the capacity-aware allocation as a background job"""
+    time_budget = clamp_time_budget(request.values.get('time_budget', type=float))
+    job_id = job_manager.submit_allocation(time_budget)
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'time_budget': time_budget,
+        'status_url': url_for('job_status', job_id=job_id),
+    }), 202
+
+@app.route('/api/allocate')
+@admin_required
+def allocate_students():
+    """API endpoint returning the stored allocation for the current catalog"""
+    version = data_manager.get_catalog_version()
+    allocation = data_manager.get_allocation(version)
+    if not allocation:
+        job = data_manager.get_active_job(ALLOCATE)
+        return jsonify({
+            'success': False,
+            'error': 'No allocation for the current catalog yet; POST to /api/allocate to start one',
+            'catalog_version': version,
+            'job': _job_summary(job) if job else None,
+        }), 404
+    return jsonify({'success': True, **allocation})
+
+@app.route('/api/what-if', methods=['POST'])
+@admin_required
+def what_if_weights():
+    """API endpoint to preview the cohort's top choices under different matching weights"""
+    payload = request.get_json(silent=True) or {}
+    try:
+        weights = resolve_weights(matching_engine.weights, payload.get('weights') or {})
+    except (TypeError, ValueError, AttributeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    meta = component_store.current_meta()
+    if meta is None:
+        job_id = job_manager.submit_component_build(component_store)
+        return jsonify({
+            'success': False,
+            'error': 'Component scores are being rebuilt for the current catalog and profiles; retry when the job completes',
+            'job_id': job_id,
+            'status_url': url_for('job_status', job_id=job_id),
+        }), 202
+    report = component_store.what_if(matching_engine.weights, weights, meta)
+    return jsonify({'success': True, 'weights': weights, 'baseline_weights': matching_engine.weights, **report})
+
+@app.route('/api/shadow')
+@admin_required
+def shadow_summary():
+    """API endpoint summarising sampled reference-vs-optimized match comparisons"""
+    summary = data_manager.get_shadow_summary(request.args.get('source'))
+    return jsonify({'success': True, 'engine': type(matching_engine).__name__,
+                    'sample_rate': shadow_runner.sample_rate, 'dropped': shadow_runner.dropped, **summary})
+
+@app.route('/api/skills')
+@admin_required
+def skill_lookup():
+    """API endpoint listing who requires or knows ?skill=... values, else skill demand vs supply"""
+    skills = [s.strip() for s in request.args.getlist('skill') if s.strip()]
+    if not skills:
+        return jsonify({'success': True, 'demand': data_manager.get_skill_demand(request.args.get('limit', 20, type=int))})
+    return jsonify({
+        'success': True,
+        'skills': skills,
+        'internships': data_manager.get_internships_requiring(skills),
+        'students': data_manager.get_students_with_skills(skills),
+    })
+
+@app.route('/api/db-pool')
+@admin_required
+def db_pool_stats():
+    """API endpoint with this worker's SQLite connection pool and identity cache counters"""
+    return jsonify({'success': True, **pool_stats(), 'identity_cache': identity_cache.stats()})
 
 @app.route('/admin/internships', methods=['GET', 'POST'])
 @admin_required
@@ -385,7 +597,8 @@ def admin_internships():
                 'affirmative_action_required': request.form.get('affirmative_action_required') == 'on',
                 'apply_url': request.form.get('apply_url', '')
             }
-            data_manager.add_internship(internship_data)
+            version = data_manager.add_internship(internship_data)
+            job_manager.submit_rematch(internship_data['id'], version)
             flash('Internship added successfully!', 'success')
             return redirect(url_for('admin_internships'))
         
@@ -405,18 +618,24 @@ def admin_internships():
                 'affirmative_action_required': request.form.get('affirmative_action_required') == 'on',
                 'apply_url': request.form.get('apply_url', '')
             }
-            data_manager.update_internship(internship_id, internship_data)
+            version = data_manager.update_internship(internship_id, internship_data)
+            job_manager.submit_rematch(internship_id, version)
             flash('Internship updated successfully!', 'success')
             return redirect(url_for('admin_internships'))
         
         elif action == 'delete':
             internship_id = request.form.get('internship_id')
-            data_manager.delete_internship(internship_id)
+            version = data_manager.delete_internship(internship_id)
+            job_manager.submit_rematch(internship_id, version, deleted=True)
             flash('Internship deleted successfully!', 'success')
             return redirect(url_for('admin_internships'))
     
-    internships = data_manager.get_all_internships()
-    return render_template('admin_internships.html', internships=internships)
+    search = request.args.get('q', '').strip()
+    internships, next_after = data_manager.list_internships(
+        after=request.args.get('after', type=int), limit=ADMIN_PAGE_SIZE, search=search)
+    return render_template('admin_internships.html', internships=internships,
+                           next_after=next_after, search=search,
+                           total_internships=data_manager.get_stats()['internships'])
 
 @app.route('/admin/students/delete', methods=['POST'])
 @admin_required
@@ -427,6 +646,7 @@ def admin_delete_student():
         student = data_manager.get_student(student_id)
         if student:
             data_manager.delete_student(student_id)
+            identity_cache.invalidate(('student', student_id))
             flash(f'Student "{student["name"]}" deleted successfully.', 'success')
         else:
             flash('Student not found.', 'error')
@@ -437,43 +657,41 @@ def admin_delete_student():
 @app.route('/admin/logs')
 @admin_required
 def admin_logs():
-    """View activity logs for the admin panel."""
-    students = data_manager.get_all_students()
-    matches = data_manager.get_all_matches()
-    internships = data_manager.get_all_internships()
+    """View activity logs for the admin panel, one keyset page at a time."""
+    # ?after=<timestamp>,<kind>,<key> of the previous page's last entry
+    parts = request.args.get('after', '').rsplit(',', 2)
+    after = (parts[0], parts[1], int(parts[2])) if len(parts) == 3 and parts[2].isdigit() else None
+    entries, next_key = data_manager.list_activity(after=after, limit=ADMIN_PAGE_SIZE)
+    counts = data_manager.get_stats()
 
     logs = []
-    for s in students:
-        logs.append({
-            'type': 'registration',
-            'icon': 'fas fa-user-plus',
-            'color': 'var(--blue)',
-            'message': f'{s["name"]} registered',
-            'detail': s.get('email', ''),
-            'timestamp': s.get('created_at', ''),
-        })
-    for m in matches:
-        student = next((s for s in students if s['id'] == m['student_id']), None)
-        name = student['name'] if student else 'Unknown'
-        top_match = m['matches'][0]['internship']['title'] if m.get('matches') else 'No matches'
-        score = m['matches'][0]['score'] if m.get('matches') else 0
-        logs.append({
-            'type': 'match',
-            'icon': 'fas fa-handshake',
-            'color': 'var(--green)',
-            'message': f'{name} matched with {top_match}',
-            'detail': f'Score: {score}%',
-            'timestamp': m.get('timestamp', ''),
-        })
-
-    logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    for entry in entries:
+        if entry['kind'] == 'registration':
+            logs.append({
+                'type': 'registration',
+                'icon': 'fas fa-user-plus',
+                'color': 'var(--blue)',
+                'message': f'{entry["name"]} registered',
+                'detail': entry['detail'] or '',
+                'timestamp': entry['timestamp'] or '',
+            })
+        else:
+            logs.append({
+                'type': 'match',
+                'icon': 'fas fa-handshake',
+                'color': 'var(--green)',
+                'message': f'{entry["name"] or "Unknown"} matched with {entry["detail"]}',
+                'detail': f'Score: {entry["score"]}%',
+                'timestamp': entry['timestamp'] or '',
+            })
 
     return render_template('admin_logs.html',
                          logs=logs,
+                         next_after=','.join(str(part) for part in next_key) if next_key else None,
                          stats={
-                             'total_students': len(students),
-                             'total_matches': len(matches),
-                             'total_internships': len(internships),
+                             'total_students': counts['students'],
+                             'total_matches': counts['matches'],
+                             'total_internships': counts['internships'],
                          })
 
 @app.route('/upload-resume', methods=['GET', 'POST'])
@@ -527,7 +745,7 @@ def upload_resume():
             
             # Get student's current profile data
             student_id = session.get('student_id')
-            student = data_manager.get_student(student_id)
+            student = cached_student(student_id)
             
             # Merge resume data with student profile for matching
             # Use resume skills if available, otherwise use profile skills
@@ -549,20 +767,13 @@ def upload_resume():
                 'experience': resume_data.get('experience', student.get('experience', 'fresher')),
             }
             
-            # Run matching against internal internships
-            internships = data_manager.get_all_internships()
-            internal_matches = matching_engine.find_matches(virtual_student, internships)
-            
-            # Run live matching
-            from internship_fetcher import InternshipFetcher
-            fetcher = InternshipFetcher()
-            live_internships = fetcher.fetch_all(
-                query='',
+            # Match against internal internships while live platforms are scraped
+            internal_matches, live_matches, _ = match_with_live(
+                virtual_student,
                 location=student.get('location_preference', ''),
                 skills=matching_skills,
                 max_per_platform=8
             )
-            live_matches = matching_engine.find_live_matches(virtual_student, live_internships)
             
             return render_template('resume_results.html',
                                  resume_data=resume_data,
@@ -574,7 +785,7 @@ def upload_resume():
             flash(f'Error processing resume: {str(e)}', 'error')
             return redirect(url_for('upload_resume'))
     
-    student = data_manager.get_student(session.get('student_id'))
+    student = cached_student(session.get('student_id'))
     return render_template('upload_resume.html', student=student)
 
 @app.route('/logout')
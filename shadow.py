@@ -0,0 +1,342 @@
+"""
+Shadow comparison
+Runs the pair-by-pair reference scorer next to the optimized engine and
+records how far the optimized rankings drift from it, so faster paths can
+serve traffic behind a flag with measured confidence.
+"""
+
+import logging
+import os
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Union
+
+from catalog_index import CatalogIndex
+from location_index import get_location_index
+from matching_engine import MatchingEngine
+from records import MatchRecord
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceEngine:
+    """Matching as it worked before any optimization, kept as a frozen copy.
+
+    Every pair goes through ``calculate_match_score`` and the list is sorted
+    on the rounded score, stable in catalog order. The scorer is a copy of
+    the original per-pair code, not a subclass of MatchingEngine, so changes
+    to the engine cannot leak into the definition it is checked against. The
+    only change since is location matching through the gazetteer, which the
+    scoring definition adopted deliberately (SCORING_VERSION 2). Slow, but it
+    is the definition the optimized paths must reproduce.
+    """
+
+    def __init__(self):
+        self.weights = {
+            'skills_match': 0.30,
+            'education_match': 0.20,
+            'location_preference': 0.15,
+            'interest_alignment': 0.15,
+            'cgpa_score': 0.10,
+            'affirmative_action': 0.05,
+            'past_participation': 0.05
+        }
+        self.location_index = get_location_index()
+
+    def find_matches(self, student: Dict[str, Any], internships: Union[List[Dict[str, Any]], CatalogIndex],
+                     top_k: int = 10, include_reasoning: bool = True) -> List[Dict[str, Any]]:
+        rows = internships.internships if isinstance(internships, CatalogIndex) else internships
+        scored = [(self.calculate_match_score(student, internship), internship) for internship in rows]
+        scored.sort(key=lambda x: round(x[0], 2), reverse=True)
+
+        matches = [
+            MatchRecord(internship, round(score, 2), rank)
+            for rank, (score, internship) in enumerate(scored[:top_k], start=1)
+        ]
+        if include_reasoning:
+            for match, (score, _) in zip(matches, scored):
+                match.reasoning = self.generate_reasoning(student, match.internship, score)
+        return matches
+
+    def find_matches_batch(self, students: List[Dict[str, Any]],
+                           internships: Union[List[Dict[str, Any]], CatalogIndex],
+                           top_k: int = 10, chunk_size: int = 256,
+                           include_reasoning: bool = True) -> List[List[Dict[str, Any]]]:
+        return [self.find_matches(student, internships, top_k, include_reasoning) for student in students]
+
+    def calculate_match_score(self, student: Dict[str, Any], internship: Dict[str, Any]) -> float:
+        skills_score = self.calculate_skills_match(student.get('skills', []),
+                                                   internship.get('required_skills', []))
+        education_score = self.calculate_education_match(student.get('education', ''),
+                                                         internship.get('education_requirement', ''))
+        location_score = self.calculate_location_match(student.get('location_preference', ''),
+                                                       internship.get('location', ''))
+        interest_score = self.calculate_interest_match(student.get('interests', []),
+                                                       internship.get('sector', ''))
+        cgpa_score = min(student.get('cgpa', 0) / 10.0, 1.0)
+        affirmative_score = self.calculate_affirmative_action_bonus(student, internship)
+        participation_score = self.calculate_participation_score(student)
+
+        total_score = (
+            skills_score * self.weights['skills_match'] +
+            education_score * self.weights['education_match'] +
+            location_score * self.weights['location_preference'] +
+            interest_score * self.weights['interest_alignment'] +
+            cgpa_score * self.weights['cgpa_score'] +
+            affirmative_score * self.weights['affirmative_action'] +
+            participation_score * self.weights['past_participation']
+        ) * 100
+
+        return max(0, min(100, total_score))
+
+    def calculate_skills_match(self, student_skills: List[str], required_skills: List[str]) -> float:
+        if not required_skills:
+            return 0.5
+        matched_skills = set(student_skills).intersection(set(required_skills))
+        return len(matched_skills) / len(required_skills)
+
+    def calculate_education_match(self, student_education: str, required_education: str) -> float:
+        education_hierarchy = {
+            'high school': 1,
+            '12th': 2,
+            'diploma': 3,
+            'undergraduate': 4,
+            'bachelor': 4,
+            'postgraduate': 5,
+            'master': 5,
+            'phd': 6
+        }
+        student_level = education_hierarchy.get(student_education.lower(), 0)
+        required_level = education_hierarchy.get(required_education.lower(), 0)
+        if student_level >= required_level:
+            return 1.0
+        return student_level / required_level if required_level > 0 else 0.5
+
+    def calculate_location_match(self, student_preference: str, internship_location: str) -> float:
+        if student_preference.lower() == 'any' or not student_preference:
+            return 0.7
+        if self.location_index.matches(student_preference, internship_location):
+            return 1.0
+        return 0.3
+
+    def calculate_interest_match(self, student_interests: List[str], internship_sector: str) -> float:
+        if not student_interests:
+            return 0.5
+        for interest in student_interests:
+            if interest.lower() in internship_sector.lower():
+                return 1.0
+        return 0.3
+
+    def calculate_affirmative_action_bonus(self, student: Dict[str, Any], internship: Dict[str, Any]) -> float:
+        bonus = 0.0
+        if student.get('location_type') == 'rural':
+            bonus += 0.3
+        if student.get('category') in ['SC', 'ST']:
+            bonus += 0.4
+        elif student.get('category') == 'OBC':
+            bonus += 0.2
+        if internship.get('affirmative_action_required', False):
+            bonus += 0.3
+        return min(bonus, 1.0)
+
+    def calculate_participation_score(self, student: Dict[str, Any]) -> float:
+        return 0.3 if student.get('past_participation', False) else 1.0
+
+    def generate_reasoning(self, student: Dict[str, Any], internship: Dict[str, Any], score: float) -> List[str]:
+        reasons = []
+        student_skills = set(student.get('skills', []))
+        required_skills = set(internship.get('required_skills', []))
+        matched_skills = student_skills.intersection(required_skills)
+        if matched_skills:
+            reasons.append(f"Skills match: {', '.join(matched_skills)}")
+        if len(matched_skills) < len(required_skills):
+            reasons.append(f"Missing skills: {', '.join(required_skills - student_skills)}")
+
+        if student.get('education', '').lower() in ['bachelor', 'undergraduate', 'postgraduate', 'master']:
+            reasons.append("Education requirement satisfied")
+
+        preference = student.get('location_preference', '')
+        if preference.lower() != 'any' and self.location_index.matches(preference, internship.get('location', '')):
+            reasons.append("Location preference matches")
+
+        cgpa = student.get('cgpa', 0)
+        if cgpa >= 8.0:
+            reasons.append("Excellent academic performance")
+        elif cgpa >= 7.0:
+            reasons.append("Good academic performance")
+
+        if student.get('location_type') == 'rural':
+            reasons.append("Rural background advantage")
+        if student.get('category') in ['SC', 'ST', 'OBC']:
+            reasons.append("Social category consideration")
+        return reasons[:5]
+
+
+class ReferenceServedEngine(MatchingEngine):
+    """MatchingEngine whose catalog rankings come from the ReferenceEngine.
+
+    What ``MATCHING_ENGINE=reference`` serves: find_matches and
+    find_matches_batch use the frozen scorer, every other path (live
+    matching, batch jobs, the component store) stays the engine's own.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.reference = ReferenceEngine()
+
+    def find_matches(self, student: Dict[str, Any], internships: Union[List[Dict[str, Any]], CatalogIndex],
+                     top_k: int = 10, include_reasoning: bool = True) -> List[Dict[str, Any]]:
+        return self.reference.find_matches(student, internships, top_k, include_reasoning)
+
+    def find_matches_batch(self, students: List[Dict[str, Any]],
+                           internships: Union[List[Dict[str, Any]], CatalogIndex],
+                           top_k: int = 10, chunk_size: int = 256,
+                           include_reasoning: bool = True) -> List[List[Dict[str, Any]]]:
+        return self.reference.find_matches_batch(students, internships, top_k, chunk_size, include_reasoning)
+
+
+@dataclass
+class Tolerances:
+    """Largest drift from the reference that still counts as a pass."""
+
+    score: float = 0.0      # absolute difference of a shared row's rounded score
+    overlap: float = 1.0    # minimum share of reference rows the candidate also returns
+    rank: int = 0           # absolute rank difference of a shared row
+
+    @classmethod
+    def from_env(cls) -> 'Tolerances':
+        return cls(
+            score=float(os.environ.get('SHADOW_SCORE_TOLERANCE', cls.score)),
+            overlap=float(os.environ.get('SHADOW_MIN_OVERLAP', cls.overlap)),
+            rank=int(os.environ.get('SHADOW_RANK_TOLERANCE', cls.rank)),
+        )
+
+
+def _match_key(match: Dict[str, Any]) -> str:
+    internship = match['internship']
+    return internship.get('id') or internship.get('apply_url') or internship.get('title', '')
+
+
+def compare(reference: List[Dict[str, Any]], candidate: List[Dict[str, Any]],
+            tolerances: Optional[Tolerances] = None) -> Dict[str, Any]:
+    """Score deltas, top-k overlap and rank differences between two ranked lists."""
+    tolerances = tolerances or Tolerances()
+    reference_rows = {_match_key(m): (rank, m['score']) for rank, m in enumerate(reference, start=1)}
+    candidate_rows = {_match_key(m): (rank, m['score']) for rank, m in enumerate(candidate, start=1)}
+    shared = reference_rows.keys() & candidate_rows.keys()
+
+    size = max(len(reference_rows), len(candidate_rows))
+    overlap = len(shared) / size if size else 1.0
+    score_deltas = [abs(reference_rows[key][1] - candidate_rows[key][1]) for key in shared]
+    rank_diffs = [abs(reference_rows[key][0] - candidate_rows[key][0]) for key in shared]
+
+    result = {
+        'top_k': size,
+        'overlap': round(overlap, 4),
+        'max_score_delta': round(max(score_deltas, default=0.0), 6),
+        'mean_score_delta': round(sum(score_deltas) / len(score_deltas), 6) if score_deltas else 0.0,
+        'max_rank_diff': max(rank_diffs, default=0),
+        'missing': sorted(reference_rows.keys() - shared),
+        'extra': sorted(candidate_rows.keys() - shared),
+    }
+    result['passed'] = (result['max_score_delta'] <= tolerances.score
+                        and overlap >= tolerances.overlap
+                        and result['max_rank_diff'] <= tolerances.rank)
+    return result
+
+
+def summarize(comparisons: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate of many compare() results."""
+    return {
+        'comparisons': len(comparisons),
+        'failed': sum(1 for c in comparisons if not c['passed']),
+        'min_overlap': min((c['overlap'] for c in comparisons), default=1.0),
+        'max_score_delta': max((c['max_score_delta'] for c in comparisons), default=0.0),
+        'max_rank_diff': max((c['max_rank_diff'] for c in comparisons), default=0),
+    }
+
+
+class ShadowRunner:
+    """Compares the engine serving requests with the other implementation.
+
+    ``observe`` is called with the matches a request already returned; for a
+    ``sample_rate`` share of calls it queues a recomputation with the other
+    engine on a background thread, which records the comparison and logs
+    any tolerance violation. At most ``max_pending`` comparisons wait at a
+    time; samples beyond that are dropped and counted. It never raises into
+    the request.
+    """
+
+    def __init__(self, data_manager, served: MatchingEngine, sample_rate: float = 0.0,
+                 tolerances: Optional[Tolerances] = None, max_pending: int = 32):
+        self.data_manager = data_manager
+        self.served = served
+        self.other = MatchingEngine() if isinstance(served, ReferenceServedEngine) else ReferenceEngine()
+        self.sample_rate = sample_rate
+        self.tolerances = tolerances or Tolerances()
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow')
+
+    def observe(self, student: Dict[str, Any], catalog: CatalogIndex,
+                served_matches: List[Dict[str, Any]], top_k: int = 10) -> Optional[Future]:
+        """Queue a comparison if this call is sampled; returns its future, else None."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return None
+            self._pending += 1
+        return self._executor.submit(self._compare_request, student, catalog, list(served_matches), top_k)
+
+    def _compare_request(self, student: Dict[str, Any], catalog: CatalogIndex,
+                         served_matches: List[Dict[str, Any]], top_k: int) -> Dict[str, Any] | None:
+        try:
+            other_matches = self.other.find_matches(student, catalog, top_k=top_k, include_reasoning=False)
+            if isinstance(self.served, ReferenceServedEngine):
+                result = compare(served_matches, other_matches, self.tolerances)
+            else:
+                result = compare(other_matches, served_matches, self.tolerances)
+            self._record('request', student.get('id'), catalog, result)
+            return result
+        except Exception:
+            logger.exception("Shadow comparison failed")
+            return None
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def run_corpus(self, students: List[Dict[str, Any]], internships: Union[List[Dict[str, Any]], CatalogIndex],
+                   top_k: int = 10, record: bool = False) -> Dict[str, Any]:
+        """Compare both engines on every student of a corpus, batch path included."""
+        catalog = MatchingEngine._as_catalog(internships)
+        candidate = self.other if isinstance(self.served, ReferenceServedEngine) else self.served
+        reference = ReferenceEngine()
+        single, batch = [], []
+        candidate_batch = candidate.find_matches_batch(students, catalog, top_k=top_k, include_reasoning=False)
+        for student, batch_matches in zip(students, candidate_batch):
+            reference_matches = reference.find_matches(student, catalog, top_k=top_k, include_reasoning=False)
+            candidate_matches = candidate.find_matches(student, catalog, top_k=top_k, include_reasoning=False)
+            single.append(compare(reference_matches, candidate_matches, self.tolerances))
+            batch.append(compare(reference_matches, batch_matches, self.tolerances))
+            if record:
+                self._record('corpus', student.get('id'), catalog, single[-1])
+        return {'find_matches': summarize(single), 'find_matches_batch': summarize(batch)}
+
+    def _record(self, source: str, student_id: str | None, catalog: CatalogIndex, result: Dict[str, Any]):
+        if not result['passed']:
+            logger.warning(f"Shadow mismatch for student {student_id}: overlap={result['overlap']} "
+                           f"max_score_delta={result['max_score_delta']} max_rank_diff={result['max_rank_diff']}")
+        self.data_manager.add_shadow_result({
+            'source': source,
+            'student_id': student_id,
+            'catalog_version': catalog.version,
+            'created_at': datetime.now().isoformat(),
+            **result,
+        })
@@ -238,6 +238,10 @@ function initializeMatchingInterface() {
     const matchAllButton = document.getElementById('match-all-btn');
     if (matchAllButton) {
         matchAllButton.addEventListener('click', runMatchingForAll);
+        // Resume following a batch that was started before this page load
+        if (matchAllButton.dataset.jobId) {
+            pollMatchAllJob(matchAllButton.dataset.jobId);
+        }
     }
 }
 
@@ -257,34 +261,81 @@ function runMatching(studentId) {
 
 function runMatchingForAll() {
     const button = document.getElementById('match-all-btn');
-    const originalText = button.textContent;
     
     // Show loading state
-    button.innerHTML = '<span class="spinner"></span> Matching All Students...';
+    button.innerHTML = '<span class="spinner"></span> Starting...';
     button.disabled = true;
     
-    // Make API call
-    fetch('/api/match-all')
+    // Start the background job, then follow its progress
+    fetch('/api/match-all', { method: 'POST' })
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                showNotification('Success', `Matched ${data.total_matches} students successfully!`, 'success');
+                pollMatchAllJob(data.job_id);
+            } else {
+                showNotification('Error', 'Failed to run matching for all students.', 'error');
+                resetMatchAllButton();
+            }
+        })
+        .catch(error => {
+            showNotification('Error', 'An error occurred while matching students.', 'error');
+            resetMatchAllButton();
+        });
+}
+
+function pollMatchAllJob(jobId) {
+    const button = document.getElementById('match-all-btn');
+    const cancelButton = document.getElementById('match-all-cancel-btn');
+    button.disabled = true;
+    if (cancelButton) {
+        cancelButton.classList.remove('d-none');
+        cancelButton.onclick = () => {
+            cancelButton.disabled = true;
+            fetch(`/api/jobs/${jobId}/cancel`, { method: 'POST' });
+        };
+    }
+    
+    fetch(`/api/jobs/${jobId}`)
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                throw new Error(data.error);
+            }
+            const job = data.job;
+            if (job.status === 'queued' || job.status === 'running') {
+                button.innerHTML = `<span class="spinner"></span> Matching... ${job.percent}%`;
+                setTimeout(() => pollMatchAllJob(jobId), 1000);
+                return;
+            }
+            resetMatchAllButton();
+            if (job.status === 'completed') {
+                showNotification('Success', `Matched ${job.progress_done} students successfully!`, 'success');
                 setTimeout(() => {
                     location.reload();
                 }, 1500);
+            } else if (job.status === 'cancelled') {
+                showNotification('Cancelled', `Matching stopped after ${job.progress_done} students.`, 'warning');
             } else {
                 showNotification('Error', 'Failed to run matching for all students.', 'error');
             }
         })
         .catch(error => {
             showNotification('Error', 'An error occurred while matching students.', 'error');
-        })
-        .finally(() => {
-            button.textContent = originalText;
-            button.disabled = false;
+            resetMatchAllButton();
         });
 }
 
+function resetMatchAllButton() {
+    const button = document.getElementById('match-all-btn');
+    const cancelButton = document.getElementById('match-all-cancel-btn');
+    button.innerHTML = '<i class="fas fa-magic me-1"></i>Match All';
+    button.disabled = false;
+    if (cancelButton) {
+        cancelButton.classList.add('d-none');
+        cancelButton.disabled = false;
+    }
+}
+
 // Progress Bar Animation
 function initializeProgressBars() {
     const progressBars = document.querySelectorAll('.progress-bar');